@@ -1,43 +1,357 @@
-from PyQt5.QtWidgets import QLabel, QWidget
-from PyQt5.QtGui import QPixmap, QPainter, QPen, QBrush, QColor
-from PyQt5.QtCore import Qt, QRect, QPoint
+from collections import OrderedDict
+from contextlib import contextmanager
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QLabel, QWidget, QStackedWidget
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor, QImage, QImageReader
+from PyQt5.QtCore import Qt, QObject, QRect, QRectF, QPoint, QPointF, QTimer, QRunnable, QThreadPool, pyqtSignal
+
+PIXMAP_CACHE_SIZE = 16  # 全局缓存的原始图像数量
+_pixmap_cache = OrderedDict()  # 已加载的原始图像 {image_path: QPixmap}，按最近使用排序
+
+def _get_cached_pixmap(img_path):
+    """获取已缓存的原始图像，不存在时返回None"""
+    pixmap = _pixmap_cache.get(img_path)
+    if pixmap is not None:
+        _pixmap_cache.move_to_end(img_path)
+    return pixmap
+
+def _cache_pixmap(img_path, pixmap):
+    """缓存原始图像，超出容量时淘汰最久未使用的图像"""
+    _pixmap_cache[img_path] = pixmap
+    _pixmap_cache.move_to_end(img_path)
+    while len(_pixmap_cache) > PIXMAP_CACHE_SIZE:
+        _pixmap_cache.popitem(last=False)
+
+ARRAY_CACHE_SIZE = 2  # 全局缓存的原始图像像素数组数量
+_array_cache = OrderedDict()  # 原始图像的像素数组 {pixmap.cacheKey(): (QImage, ndarray)}
+
+def _get_pixmap_array(pixmap):
+    """获取与原始图像共享内存的 (h, w, 4) 像素数组，供OpenCV缩放使用"""
+    key = pixmap.cacheKey()
+    entry = _array_cache.get(key)
+    if entry is None:
+        image = pixmap.toImage()
+        if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied):
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        array = np.frombuffer(bits, np.uint8).reshape(image.height(), image.bytesPerLine() // 4, 4)
+        # QImage 必须与数组一起保存，数组直接引用其内存
+        entry = (image, array[:, :image.width()])
+        _array_cache[key] = entry
+        while len(_array_cache) > ARRAY_CACHE_SIZE:
+            _array_cache.popitem(last=False)
+    else:
+        _array_cache.move_to_end(key)
+    return entry
+
+def _map_rect_to_source(widget_w, widget_h, scaled_w, scaled_h, orig_w, orig_h, rx, ry, rw, rh):
+    """将居中显示的缩放图像上的矩形映射回原始图像坐标，只做数值运算，返回 (x, y, w, h)"""
+    # 计算缩放比例
+    scale_x = orig_w / scaled_w
+    scale_y = orig_h / scaled_h
+    
+    # 计算图像在标签中的偏移量
+    x_offset = (widget_w - scaled_w) // 2
+    y_offset = (widget_h - scaled_h) // 2
+    
+    # 计算原始图像中的矩形
+    return (
+        int((rx - x_offset) * scale_x),
+        int((ry - y_offset) * scale_y),
+        int(rw * scale_x),
+        int(rh * scale_y)
+    )
+
+class _LoadTask(QRunnable):
+    """在线程池中读取并解码图像文件，完成后通过信号把结果交回界面线程"""
+    def __init__(self, img_path, ready_signal):
+        super().__init__()
+        self.img_path = img_path
+        self.ready_signal = ready_signal
+    
+    def run(self):
+        image = QImageReader(self.img_path).read()
+        self.ready_signal.emit(self.img_path, image)
+
+class _ImageLoader(QObject):
+    """显示组件和预读共用的后台加载器：同一图像同时只解码一次，结果放入全局缓存后通知所有显示组件"""
+    decoded = pyqtSignal(str, QImage)  # 线程池中解码完成信号 (image_path, image)
+    loaded = pyqtSignal(str, QPixmap)  # 界面线程中创建好QPixmap的信号 (image_path, pixmap)
+    
+    def __init__(self):
+        super().__init__()
+        self._pending = set()  # 正在后台解码的图像路径
+        self.decoded.connect(self._on_decoded)
+    
+    def load(self, img_path):
+        """提交后台解码，已缓存或正在解码的图像不重复提交"""
+        if img_path in self._pending or img_path in _pixmap_cache:
+            return
+        self._pending.add(img_path)
+        QThreadPool.globalInstance().start(_LoadTask(img_path, self.decoded))
+    
+    def _on_decoded(self, img_path, image):
+        """在界面线程中创建QPixmap并缓存"""
+        self._pending.discard(img_path)
+        pixmap = QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            _cache_pixmap(img_path, pixmap)
+        self.loaded.emit(img_path, pixmap)
+
+_image_loader = None  # 全局共用的后台加载器，首次使用时创建
+
+def _get_image_loader():
+    global _image_loader
+    if _image_loader is None:
+        _image_loader = _ImageLoader()
+    return _image_loader
 
 class BaseImageDisplay(QLabel):
     """图像显示组件基类，定义通用接口和方法"""
+    SCALED_CACHE_SIZE = 4  # 每个组件保留的缩放结果数量
+    RESCALE_DELAY = 40  # 窗口大小变化后延迟重新缩放的时间（毫秒）
+    _BACKGROUND_COLOR = QColor(255, 255, 255)  # 背景色
+    _BORDER_PEN = QPen(QColor(204, 204, 204), 1)  # 边框画笔
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.image_manager = None  # 当前显示的图像管理器
         self.original_pixmap = None  # 原始图像
         self.scaled_pixmap = None  # 缩放后的图像
+        self._scaled_cache = {}  # 缩放结果缓存 {(image_path, width, height): QPixmap}
+        self._interactive = False  # 是否处于拖动/滚轮等交互过程中
+        self._needs_smooth = False  # 交互期间使用了快速缩放，结束后需要平滑重缩放
+        self._last_scale_key = None  # 上次平滑缩放时的(原图标识, 宽, 高)
+        self._geom_key = None  # 几何计算缓存的失效标识
+        self._geom_cache = None  # 缓存的几何计算结果
         
         # 设置组件属性
         self.setAlignment(Qt.AlignCenter)
         self.setStyleSheet('background-color: #ffffff; border: 1px solid #cccccc;')
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.StrongFocus)
+        # 子类自行绘制完整背景，Qt无需预先擦除
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        
+        # 合并连续的窗口大小变化事件，只在尺寸稳定后重新缩放
+        self._rescale_timer = QTimer(self)
+        self._rescale_timer.setSingleShot(True)
+        self._rescale_timer.timeout.connect(self._do_scale_and_update)
+        
+        _get_image_loader().loaded.connect(self._on_pixmap_ready)
         
     def set_image(self, image_manager):
         """设置要显示的图像"""
         self.image_manager = image_manager
+        self._geom_key = None
         if image_manager:
-            img_path = image_manager.image_path
-            self.original_pixmap = QPixmap(img_path)
-            self._scale_image()
+            self._load_image(image_manager.image_path)
         else:
             self.original_pixmap = None
             self.scaled_pixmap = None
             self.setText('请选择一张图像')
         self.update()
+    
+    def _load_image(self, img_path):
+        """加载图像：已缓存时直接使用，否则提交到线程池解码，完成前显示加载提示"""
+        pixmap = _get_cached_pixmap(img_path)
+        if pixmap is not None:
+            self._apply_pixmap(pixmap)
+            return
+        
+        self.original_pixmap = None
+        self.scaled_pixmap = None
+        self.setText('正在加载图像...')
+        # 相邻图像的预读可能已在解码该图像，加载器不会重复提交，完成后统一通知
+        _get_image_loader().load(img_path)
+    
+    def _on_pixmap_ready(self, img_path, pixmap):
+        """后台加载完成的回调（QPixmap已由加载器创建并缓存）"""
+        # 快速切换图像时丢弃已不是当前图像的加载结果，已显示该图像时也无需重新应用
+        if (self.image_manager and self.image_manager.image_path == img_path
+                and self.original_pixmap is None):
+            self._geom_key = None
+            self._apply_pixmap(pixmap)
+            self.update()
+    
+    def _apply_pixmap(self, pixmap):
+        """使用加载好的原始图像，缩放后通知子类"""
+        if pixmap.isNull():
+            self.original_pixmap = None
+            self.scaled_pixmap = None
+            self.setText('无法加载图像')
+            return
+        self.original_pixmap = pixmap
+        self._scale_image()
+        self.on_image_loaded()
+    
+    def on_image_loaded(self):
+        """图像加载完成后的回调"""
+        pass
         
     def _scale_image(self):
         """缩放图像以适应组件大小"""
         if self.original_pixmap and not self.original_pixmap.isNull():
-            self.scaled_pixmap = self.original_pixmap.scaled(
-                self.size(), 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
+            # 原图和目标尺寸都没有变化时（如尺寸未变的resize事件）无需重新缩放
+            target = self.size()
+            scale_key = (self.original_pixmap.cacheKey(), target.width(), target.height())
+            if scale_key == self._last_scale_key and self.scaled_pixmap:
+                return
+            
+            key = (self.image_manager.image_path, target.width(), target.height())
+            scaled = self._scaled_cache.get(key)
+            if scaled is None and self._interactive:
+                # 交互期间使用快速缩放，不写入缓存，交互结束后再平滑缩放
+                scaled = self._scaled_to(target, Qt.FastTransformation)
+                self._needs_smooth = True
+                scale_key = None
+            elif scaled is None:
+                scaled = self._scaled_to(target, Qt.SmoothTransformation)
+                self._scaled_cache[key] = scaled
+                # 超出容量时淘汰最早加入的缓存项
+                while len(self._scaled_cache) > self.SCALED_CACHE_SIZE:
+                    del self._scaled_cache[next(iter(self._scaled_cache))]
+            self.scaled_pixmap = scaled
+            self._last_scale_key = scale_key
+    
+    def _scaled_to(self, target, mode):
+        """按原图宽高比缩放到目标尺寸内，使用OpenCV的多线程SIMD缩放代替Qt的单线程平滑缩放"""
+        size = self.original_pixmap.size().scaled(target, Qt.KeepAspectRatio)
+        if size.width() <= 0 or size.height() <= 0:
+            return QPixmap()
+        
+        image, array = _get_pixmap_array(self.original_pixmap)
+        if mode == Qt.FastTransformation:
+            interpolation = cv2.INTER_NEAREST
+        elif size.width() < image.width():
+            interpolation = cv2.INTER_AREA  # 缩小时区域插值质量最好
+        else:
+            interpolation = cv2.INTER_LINEAR
+        # 直接写入Qt分配的图像内存，避免结果数组先于QPixmap释放
+        scaled_image = QImage(size, image.format())
+        bits = scaled_image.bits()
+        bits.setsize(scaled_image.sizeInBytes())
+        dst = np.frombuffer(bits, np.uint8).reshape(size.height(), size.width(), 4)
+        cv2.resize(array, (size.width(), size.height()), dst=dst, interpolation=interpolation)
+        return QPixmap.fromImage(scaled_image)
+    
+    def _end_interactive(self):
+        """结束交互状态，如有需要使用平滑缩放重新生成图像，并以高质量重绘"""
+        self._interactive = False
+        if self._needs_smooth:
+            self._needs_smooth = False
+            self._scale_image()
+        self.update()
+    
+    def _begin_paint(self, event):
+        """创建裁剪到重绘区域的画笔，并绘制背景、边框和提示文本"""
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.fillRect(event.rect(), self._BACKGROUND_COLOR)
+        painter.setPen(self._BORDER_PEN)
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        
+        # 没有图像时绘制提示文本（替代QLabel默认的文本绘制）
+        if (not self.scaled_pixmap or self.scaled_pixmap.isNull()) and self.text():
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+        return painter
+    
+    def _get_processed_image_rect(self):
+        """计算处理后图像的显示区域"""
+        # 组件尺寸、缩放图像和裁切区域都未变化时直接返回上次的结果
+        key = (
+            self.width(), self.height(),
+            self.scaled_pixmap.cacheKey() if self.scaled_pixmap else 0,
+            self.image_manager.roi if self.image_manager else None
+        )
+        if key == self._geom_key:
+            return self._geom_cache
+        self._geom_cache = self._compute_processed_image_rect()
+        self._geom_key = key
+        return self._geom_cache
+    
+    def _compute_processed_image_rect(self):
+        """根据裁切区域计算处理后图像居中显示的矩形"""
+        if self.scaled_pixmap is None or self.scaled_pixmap.isNull():
+            return QRect()
+        
+        img_width = self.scaled_pixmap.width()
+        img_height = self.scaled_pixmap.height()
+        
+        # 如果有裁切，调整图像大小
+        if self.image_manager and self.image_manager.roi:
+            x, y, w, h = self.image_manager.roi
+            # 计算原始图像到显示图像的缩放比例
+            scale_x = self.scaled_pixmap.width() / self.original_pixmap.width()
+            scale_y = self.scaled_pixmap.height() / self.original_pixmap.height()
+            
+            # 计算显示区域中的裁切矩形
+            display_x = (self.width() - self.scaled_pixmap.width()) // 2 + int(x * scale_x)
+            display_y = (self.height() - self.scaled_pixmap.height()) // 2 + int(y * scale_y)
+            display_width = int(w * scale_x)
+            display_height = int(h * scale_y)
+            
+            # 计算居中显示的缩放比例
+            scale = min(self.width() / display_width, self.height() / display_height)
+            new_width = int(display_width * scale)
+            new_height = int(display_height * scale)
+            
+            return QRect(
+                (self.width() - new_width) // 2,
+                (self.height() - new_height) // 2,
+                new_width,
+                new_height
             )
+        else:
+            # 没有裁切，返回原图像居中显示的区域
+            x = (self.width() - self.scaled_pixmap.width()) // 2
+            y = (self.height() - self.scaled_pixmap.height()) // 2
+            return QRect(x, y, self.scaled_pixmap.width(), self.scaled_pixmap.height())
+    
+    def _draw_processed_image(self, painter):
+        """按处理状态绘制图像，返回图像的显示区域（无图像时为无效矩形）"""
+        if not self.scaled_pixmap or self.scaled_pixmap.isNull() or not self.image_manager:
+            return QRect()
+        
+        # 获取处理后的图像显示区域
+        display_rect = self._get_processed_image_rect()
+        if display_rect.isValid():
+            # 根据处理状态绘制不同的图像
+            if self.image_manager.is_resized:
+                # 如果有缩放，显示缩放后的图像
+                # 这里简化处理，实际应从image_manager获取处理后的图像数据
+                pass
+            elif self.image_manager.is_croped:
+                # 如果有裁切，显示裁切后的图像
+                x, y, w, h = self.image_manager.roi
+                source_rect = QRect(x, y, w, h)
+                painter.drawPixmap(display_rect, self.original_pixmap, source_rect)
+            else:
+                # 否则显示原始图像
+                painter.drawPixmap(
+                    (self.width() - self.scaled_pixmap.width()) // 2,
+                    (self.height() - self.scaled_pixmap.height()) // 2,
+                    self.scaled_pixmap
+                )
+        return display_rect
+    
+    @contextmanager
+    def _suspend_updates(self):
+        """在代码块内暂停重绘，退出时只统一重绘一次"""
+        if not self.updatesEnabled():
+            # 外层已经暂停，由外层负责恢复
+            yield
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            # 重新启用时Qt会自动安排一次重绘
+            self.setUpdatesEnabled(True)
     
     def reset(self):
         """重置组件状态"""
@@ -50,9 +364,15 @@ class BaseImageDisplay(QLabel):
     def resizeEvent(self, event):
         """窗口大小变化事件"""
         super().resizeEvent(event)
+        self._geom_key = None
         if self.original_pixmap:
-            self._scale_image()
-            self.update()
+            # 拖动窗口边缘时会连续触发，延迟到最后一次变化后再缩放
+            self._rescale_timer.start(self.RESCALE_DELAY)
+    
+    def _do_scale_and_update(self):
+        """延迟缩放定时器的回调"""
+        self._scale_image()
+        self.update()
     
     def on_enter_mode(self):
         """进入模式时的回调"""
@@ -64,6 +384,8 @@ class BaseImageDisplay(QLabel):
 
 class EmptyImageDisplay(BaseImageDisplay):
     """空模式图像显示组件"""
+    _HINT_COLOR = QColor(150, 150, 150)  # 提示文本颜色
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         # 不在这里设置文本，避免与paintEvent冲突
@@ -72,9 +394,7 @@ class EmptyImageDisplay(BaseImageDisplay):
         """重写set_image方法，不调用父类的setText"""
         self.image_manager = image_manager
         if image_manager:
-            img_path = image_manager.image_path
-            self.original_pixmap = QPixmap(img_path)
-            self._scale_image()
+            self._load_image(image_manager.image_path)
         else:
             self.original_pixmap = None
             self.scaled_pixmap = None
@@ -94,8 +414,8 @@ class EmptyImageDisplay(BaseImageDisplay):
         painter.setRenderHint(QPainter.Antialiasing)
         
         # 绘制白色背景和边框
-        painter.fillRect(self.rect(), QBrush(QColor(255, 255, 255)))
-        painter.setPen(QPen(QColor(204, 204, 204), 1))
+        painter.fillRect(self.rect(), self._BACKGROUND_COLOR)
+        painter.setPen(self._BORDER_PEN)
         painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
         
         # 只在没有图像时绘制提示文本
@@ -107,7 +427,7 @@ class EmptyImageDisplay(BaseImageDisplay):
             painter.setFont(font)
             
             # 设置文本颜色
-            painter.setPen(QColor(150, 150, 150))
+            painter.setPen(self._HINT_COLOR)
             
             # 绘制提示文本
             text = '暂无图像，请导入图像文件或文件夹'
@@ -126,10 +446,9 @@ class DefaultImageDisplay(BaseImageDisplay):
     """默认简单图像显示组件"""
     def paintEvent(self, event):
         """重绘事件，简单绘制图像"""
-        super().paintEvent(event)
+        painter = self._begin_paint(event)
         
         if self.scaled_pixmap and not self.scaled_pixmap.isNull():
-            painter = QPainter(self)
             # 正常绘制整个图像，居中显示
             x = (self.width() - self.scaled_pixmap.width()) // 2
             y = (self.height() - self.scaled_pixmap.height()) // 2
@@ -137,6 +456,14 @@ class DefaultImageDisplay(BaseImageDisplay):
 
 class CropImageDisplay(BaseImageDisplay):
     """裁切模式图像显示组件"""
+    _HANDLE_PIXMAP = None  # 控制点图案，所有实例共享
+    CROP_HISTORY_SIZE = 256  # 最多保留的图像裁切历史数量
+    MOVE_INTERVAL = 16  # 鼠标移动处理的最小间隔（毫秒），约为一帧
+    _PEN_RED = QPen(Qt.red, 2, Qt.SolidLine)  # 未确认的裁切框
+    _PEN_GREEN = QPen(Qt.green, 2, Qt.SolidLine)  # 已确认的裁切框
+    _PEN_WHITE_TEXT = QPen(Qt.white, 1, Qt.SolidLine)  # 提示文字
+    _MASK_COLOR = QColor(0, 0, 0, 100)  # 裁切框外的半透明黑色蒙版，降低亮度
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.aspect_ratio = None  # 默认比例为空
@@ -144,8 +471,19 @@ class CropImageDisplay(BaseImageDisplay):
         self.rectangle = QRect()  # 裁切区域矩形
         self.is_selecting = True  # 是否正在选择区域
         self.start_pos = QPoint()  # 鼠标起始位置
-        self.last_rect_size = {}  # 存储每个图像最后操作的尺寸 {image_path: rect_size}
-        self.last_rect_pos = {}  # 存储每个图像最后操作的位置 {image_path: rect_pos}
+        # 存储每个图像最后操作的尺寸和位置 {image_path: (rect_size, rect_pos)}，按最近使用排序
+        self._crop_history = OrderedDict()
+        
+        # 滚轮停止一段时间后结束交互状态
+        self._wheel_timer = QTimer(self)
+        self._wheel_timer.setSingleShot(True)
+        self._wheel_timer.timeout.connect(self._end_interactive)
+        
+        # 鼠标移动事件只记录位置，由定时器按帧率统一处理
+        self._pending_mouse_pos = None
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.timeout.connect(self._flush_move)
         
     def on_enter_mode(self):
         """进入模式时的回调"""
@@ -154,86 +492,89 @@ class CropImageDisplay(BaseImageDisplay):
         
     def set_image(self, image_manager):
         """设置要显示的图像"""
-        self.image_manager = image_manager
-        if image_manager:
-            img_path = image_manager.image_path
-            self.original_pixmap = QPixmap(img_path)
-            self._scale_image()
-            
-            # 检查图像是否有已确认的裁切区域
-            if image_manager.roi:
-                # 如果有裁切区域，显示对应的裁切框
-                x, y, w, h = image_manager.roi
-                
-                # 计算显示区域中的裁切矩形
-                scale_x = self.scaled_pixmap.width() / self.original_pixmap.width()
-                scale_y = self.scaled_pixmap.height() / self.original_pixmap.height()
-                
-                # 计算图像在标签中的偏移量
-                x_offset = (self.width() - self.scaled_pixmap.width()) // 2
-                y_offset = (self.height() - self.scaled_pixmap.height()) // 2
-                
-                # 计算显示区域中的裁切矩形
-                display_x = x_offset + int(x * scale_x)
-                display_y = y_offset + int(y * scale_y)
-                display_width = int(w * scale_x)
-                display_height = int(h * scale_y)
-                
-                self.rectangle = QRect(display_x, display_y, display_width, display_height)
-                self.is_selecting = False
-                
-                # 保存最后操作的尺寸和位置
-                self.last_rect_size[img_path] = max(display_width, display_height)
-                self.last_rect_pos[img_path] = self.rectangle
-            elif img_path in self.last_rect_size and self.aspect_ratio is not None:
-                # 如果没有确认的裁切区域，但有历史记录，则使用历史记录
-                self.rect_size = self.last_rect_size[img_path]
-                self.rectangle = self.last_rect_pos[img_path]
-                self.is_selecting = True
-            else:
-                # 否则，只有当设置了比例时才设置默认裁切区域
-                if self.aspect_ratio is not None:
-                    self._set_default_rectangle()
-                else:
-                    self.rectangle = QRect()  # 清除裁切框
-                self.is_selecting = True
-        else:
-            self.original_pixmap = None
-            self.scaled_pixmap = None
-            self.rectangle = QRect()
-            self.setText('请选择一张图像')
-        self.update()
+        # 图像加载完成前不显示上一张图像的裁切框
+        self.rectangle = QRect()
+        super().set_image(image_manager)
     
-    def _set_default_rectangle(self):
-        """设置默认的裁切区域，长边为512，保持比例"""
-        if self.scaled_pixmap and not self.scaled_pixmap.isNull():
-            img_width = self.scaled_pixmap.width()
-            img_height = self.scaled_pixmap.height()
+    def on_image_loaded(self):
+        """图像加载完成后，根据已确认的裁切区域或历史记录恢复裁切框"""
+        image_manager = self.image_manager
+        img_path = image_manager.image_path
+        
+        # 检查图像是否有已确认的裁切区域
+        if image_manager.roi:
+            # 如果有裁切区域，显示对应的裁切框
+            x, y, w, h = image_manager.roi
             
-            # 计算图像在标签中的居中位置
-            x_offset = (self.width() - img_width) // 2
-            y_offset = (self.height() - img_height) // 2
+            # 计算显示区域中的裁切矩形
+            scale_x = self.scaled_pixmap.width() / self.original_pixmap.width()
+            scale_y = self.scaled_pixmap.height() / self.original_pixmap.height()
             
-            # 根据比例计算矩形尺寸
-            if self.aspect_ratio > 1:  # 横屏比例
-                width = min(self.rect_size, img_width)
-                height = int(width / self.aspect_ratio)
-            else:  # 竖屏比例
-                height = min(self.rect_size, img_height)
-                width = int(height * self.aspect_ratio)
+            # 计算图像在标签中的偏移量
+            x_offset = (self.width() - self.scaled_pixmap.width()) // 2
+            y_offset = (self.height() - self.scaled_pixmap.height()) // 2
             
-            # 确保矩形不超出图像范围
-            width = min(width, img_width)
-            height = min(height, img_height)
+            # 计算显示区域中的裁切矩形
+            display_x = x_offset + int(x * scale_x)
+            display_y = y_offset + int(y * scale_y)
+            display_width = int(w * scale_x)
+            display_height = int(h * scale_y)
             
-            # 居中放置矩形
-            x = x_offset + (img_width - width) // 2
-            y = y_offset + (img_height - height) // 2
+            self.rectangle = QRect(display_x, display_y, display_width, display_height)
+            self.is_selecting = False
             
-            self.rectangle = QRect(x, y, width, height)
+            # 保存最后操作的尺寸和位置
+            self._save_crop_history(img_path, max(display_width, display_height))
+        elif img_path in self._crop_history and self.aspect_ratio is not None:
+            # 如果没有确认的裁切区域，但有历史记录，则使用历史记录
+            self.rect_size, rect = self._crop_history[img_path]
+            self.rectangle = QRect(rect)
+            self._crop_history.move_to_end(img_path)
+            self.is_selecting = True
+        else:
+            # 否则，只有当设置了比例时才设置默认裁切区域
+            if self.aspect_ratio is not None:
+                self._set_default_rectangle()
+            else:
+                self.rectangle = QRect()  # 清除裁切框
+            self.is_selecting = True
+    
+    def _save_crop_history(self, img_path, rect_size):
+        """记录图像最后操作的裁切尺寸和位置，超出容量时淘汰最久未使用的记录"""
+        self._crop_history[img_path] = (rect_size, QRect(self.rectangle))
+        self._crop_history.move_to_end(img_path)
+        if len(self._crop_history) > self.CROP_HISTORY_SIZE:
+            self._crop_history.popitem(last=False)
+    
+    def _set_default_rectangle(self):
+        """设置默认的裁切区域，长边为rect_size，保持比例，居中于图像"""
+        if not self.scaled_pixmap or self.scaled_pixmap.isNull() or self.aspect_ratio is None:
+            return
+        img_width, img_height = self.scaled_pixmap.width(), self.scaled_pixmap.height()
+        ratio = self.aspect_ratio
+        
+        # 先按长边确定尺寸，再在两个方向上同时约束到图像范围内
+        if ratio >= 1.0:  # 横屏比例
+            width = min(self.rect_size, img_width)
+            height = min(int(width / ratio), img_height)
+            width = min(int(height * ratio), img_width)
+        else:  # 竖屏比例
+            height = min(self.rect_size, img_height)
+            width = min(int(height * ratio), img_width)
+            height = min(int(width / ratio), img_height)
+        
+        # 居中放置矩形（图像在标签中居中显示）
+        x_offset = (self.width() - img_width) >> 1
+        y_offset = (self.height() - img_height) >> 1
+        self.rectangle = QRect(
+            x_offset + ((img_width - width) >> 1),
+            y_offset + ((img_height - height) >> 1),
+            width, height
+        )
     
     def set_aspect_ratio(self, ratio_str):
         """设置裁切比例"""
+        self._geom_key = None
         try:
             # 处理空比例情况
             if not ratio_str or ratio_str.strip() == '':
@@ -243,6 +584,7 @@ class CropImageDisplay(BaseImageDisplay):
                     # 清除图像管理器中的裁切信息
                     self.image_manager.roi = None
                     self.image_manager.state &= ~self.image_manager.STATE_CROP  # 清除裁切状态标记
+                    self._notify_state_changed()
                 self.update()
                 return
                 
@@ -250,12 +592,19 @@ class CropImageDisplay(BaseImageDisplay):
             width_ratio, height_ratio = map(int, ratio_str.split(':'))
             self.aspect_ratio = width_ratio / height_ratio
             
+            # 图像仍在后台加载时裁切框尚未布局，只记录比例，
+            # 加载完成后由on_image_loaded恢复已确认的裁切区域或设置默认裁切框
+            if self.original_pixmap is None:
+                self.update()
+                return
+            
             # 只有当没有确认裁切区域时才设置默认裁切区域
             if self.image_manager and (not self.image_manager.roi or self.rectangle.isEmpty()):
                 self._set_default_rectangle()
                 self.is_selecting = True
                 self.image_manager.roi = None
                 self.image_manager.state &= ~self.image_manager.STATE_CROP
+                self._notify_state_changed()
                 
             self.update()
         except ValueError:
@@ -264,17 +613,19 @@ class CropImageDisplay(BaseImageDisplay):
     def set_rect_size(self, size):
         """设置矩形长边大小"""
         self.rect_size = size
+        self._geom_key = None
         if self.image_manager:
             self._set_default_rectangle()
             self.update()
     
     def paintEvent(self, event):
         """重绘事件，绘制图像和裁切矩形"""
-        super().paintEvent(event)
+        painter = self._begin_paint(event)
         
         if self.scaled_pixmap and not self.scaled_pixmap.isNull():
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            # 交互过程中使用快速绘制，交互结束后再启用平滑变换
+            if not self._interactive:
+                painter.setRenderHint(QPainter.SmoothPixmapTransform)
             
             # 首先绘制完整的原始图像（底层显示原图）
             x_offset = (self.width() - self.scaled_pixmap.width()) // 2
@@ -285,23 +636,24 @@ class CropImageDisplay(BaseImageDisplay):
             if self.aspect_ratio is not None:
                 # 如果已经选择了裁切区域
                 if not self.is_selecting and not self.rectangle.isNull():
-                    # 绘制裁切范围外的低亮度效果
-                    # 1. 创建一个蒙版，覆盖整个窗口
-                    mask_color = QColor(0, 0, 0, 100)  # 半透明黑色，降低亮度
-                    painter.fillRect(self.rect(), mask_color)
-                    
-                    # 2. 在裁切区域内绘制原始亮度的图像
-                    source_rect = self._get_source_rect()
-                    painter.drawPixmap(self.rectangle, self.original_pixmap, source_rect)
+                    # 绘制裁切范围外的低亮度效果：只在裁切框上下左右四个区域叠加蒙版，
+                    # 裁切框内保留底层图像的原始亮度
+                    mask_color = self._MASK_COLOR
+                    r = self.rectangle
+                    w, h = self.width(), self.height()
+                    painter.fillRect(0, 0, w, r.top(), mask_color)
+                    painter.fillRect(0, r.bottom() + 1, w, h - r.bottom() - 1, mask_color)
+                    painter.fillRect(0, r.top(), r.left(), r.height(), mask_color)
+                    painter.fillRect(r.right() + 1, r.top(), w - r.right() - 1, r.height(), mask_color)
                 
                 # 绘制裁切矩形边框
                 if not self.rectangle.isNull():
                     if self.is_selecting:
                         # 未确认状态 - 使用红色边框
-                        pen = QPen(Qt.red, 2, Qt.SolidLine)
+                        pen = self._PEN_RED
                     else:
                         # 已确认状态 - 使用绿色边框
-                        pen = QPen(Qt.green, 2, Qt.SolidLine)
+                        pen = self._PEN_GREEN
                     painter.setPen(pen)
                     painter.drawRect(self.rectangle)
                     
@@ -309,7 +661,7 @@ class CropImageDisplay(BaseImageDisplay):
                     self._draw_control_points(painter)
                     
                     # 添加状态提示文字
-                    painter.setPen(QPen(Qt.white, 1, Qt.SolidLine))
+                    painter.setPen(self._PEN_WHITE_TEXT)
                     if self.is_selecting:
                         painter.drawText(10, 20, "拖动鼠标移动裁切框，滚轮缩放，左键确认")
                     else:
@@ -317,54 +669,74 @@ class CropImageDisplay(BaseImageDisplay):
     
     def _draw_control_points(self, painter):
         """绘制矩形的控制点"""
-        pen = QPen(Qt.white, 4, Qt.SolidLine)
-        pen.setStyle(Qt.SolidLine)
-        painter.setPen(pen)
-        
-        # 左上角
-        painter.drawPoint(self.rectangle.topLeft())
-        # 右上角
-        painter.drawPoint(self.rectangle.topRight())
-        # 左下角
-        painter.drawPoint(self.rectangle.bottomLeft())
-        # 右下角
-        painter.drawPoint(self.rectangle.bottomRight())
-        # 上中
-        painter.drawPoint(self.rectangle.left() + self.rectangle.width() // 2, self.rectangle.top())
-        # 下中
-        painter.drawPoint(self.rectangle.left() + self.rectangle.width() // 2, self.rectangle.bottom())
-        # 左中
-        painter.drawPoint(self.rectangle.left(), self.rectangle.top() + self.rectangle.height() // 2)
-        # 右中
-        painter.drawPoint(self.rectangle.right(), self.rectangle.top() + self.rectangle.height() // 2)
+        handle = self._get_handle_pixmap()
+        r = self.rectangle
+        center_x = r.left() + r.width() // 2
+        center_y = r.top() + r.height() // 2
+        points = (
+            (r.left(), r.top()),       # 左上角
+            (r.right(), r.top()),      # 右上角
+            (r.left(), r.bottom()),    # 左下角
+            (r.right(), r.bottom()),   # 右下角
+            (center_x, r.top()),       # 上中
+            (center_x, r.bottom()),    # 下中
+            (r.left(), center_y),      # 左中
+            (r.right(), center_y)      # 右中
+        )
+        for x, y in points:
+            painter.drawPixmap(x - 4, y - 4, handle)
+    
+    @classmethod
+    def _get_handle_pixmap(cls):
+        """获取控制点图案（8x8透明底，中心4x4白色方块），首次使用时创建"""
+        if cls._HANDLE_PIXMAP is None:
+            pixmap = QPixmap(8, 8)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.fillRect(2, 2, 4, 4, Qt.white)
+            painter.end()
+            cls._HANDLE_PIXMAP = pixmap
+        return cls._HANDLE_PIXMAP
     
     def _get_source_rect(self):
         """将显示区域的矩形转换为原始图像的矩形"""
+        # 组件尺寸、缩放图像和裁切框都未变化时直接返回上次的结果
+        key = (
+            self.width(), self.height(),
+            self.scaled_pixmap.cacheKey() if self.scaled_pixmap else 0,
+            self.rectangle.getRect()
+        )
+        if key == self._geom_key:
+            return self._geom_cache
+        self._geom_cache = self._compute_source_rect()
+        self._geom_key = key
+        return self._geom_cache
+    
+    def _compute_source_rect(self):
+        """计算裁切框在原始图像中对应的矩形"""
         if not self.original_pixmap or not self.scaled_pixmap or self.rectangle.isNull():
             return QRect()
         
-        # 计算缩放比例
-        scale_x = self.original_pixmap.width() / self.scaled_pixmap.width()
-        scale_y = self.original_pixmap.height() / self.scaled_pixmap.height()
-        
-        # 计算图像在标签中的偏移量
-        x_offset = (self.width() - self.scaled_pixmap.width()) // 2
-        y_offset = (self.height() - self.scaled_pixmap.height()) // 2
-        
-        # 计算原始图像中的矩形
-        x = int((self.rectangle.x() - x_offset) * scale_x)
-        y = int((self.rectangle.y() - y_offset) * scale_y)
-        width = int(self.rectangle.width() * scale_x)
-        height = int(self.rectangle.height() * scale_y)
-        
+        x, y, width, height = _map_rect_to_source(
+            self.width(), self.height(),
+            self.scaled_pixmap.width(), self.scaled_pixmap.height(),
+            self.original_pixmap.width(), self.original_pixmap.height(),
+            *self.rectangle.getRect()
+        )
         return QRect(x, y, width, height)
     
     def mousePressEvent(self, event):
         """鼠标按下事件"""
-        # 只有当设置了比例时才响应鼠标事件
-        if self.aspect_ratio is None:
+        # 只有当设置了比例且图像已加载时才响应鼠标事件
+        if self.aspect_ratio is None or self.scaled_pixmap is None:
             return
-            
+        
+        # 先应用尚未处理的鼠标移动，确保确认的是当前位置
+        if self._move_timer.isActive():
+            self._move_timer.stop()
+            self._flush_move()
+        
+        self._interactive = True
         if event.button() == Qt.LeftButton:
             if self.is_selecting:
                 # 未确认状态下，左键点击确认选择
@@ -374,11 +746,10 @@ class CropImageDisplay(BaseImageDisplay):
                 if self.image_manager:
                     source_rect = self._get_source_rect()
                     self.image_manager.set_crop((source_rect.x(), source_rect.y(), source_rect.width(), source_rect.height()))
+                    self._notify_state_changed()
                     
                     # 保存最后操作的尺寸和位置
-                    img_path = self.image_manager.image_path
-                    self.last_rect_size[img_path] = self.rect_size
-                    self.last_rect_pos[img_path] = self.rectangle
+                    self._save_crop_history(self.image_manager.image_path, self.rect_size)
                 
                 self.update()
         elif event.button() == Qt.RightButton:
@@ -389,57 +760,80 @@ class CropImageDisplay(BaseImageDisplay):
             if self.image_manager:
                 self.image_manager.roi = None
                 self.image_manager.state &= ~self.image_manager.STATE_CROP  # 清除裁切状态标记
+                self._notify_state_changed()
                 
                 # 清除本地存储的该图像的历史裁切记录
-                img_path = self.image_manager.image_path
-                if img_path in self.last_rect_size:
-                    del self.last_rect_size[img_path]
-                if img_path in self.last_rect_pos:
-                    del self.last_rect_pos[img_path]
+                self._crop_history.pop(self.image_manager.image_path, None)
                 
                 # 设置默认的裁切区域
                 self._set_default_rectangle()
             
             self.update()
     
+    def _notify_state_changed(self):
+        """裁切状态变化后只刷新图像列表中当前图像的状态单元格"""
+        image_list_widget = getattr(self.parent, 'image_list_widget', None)
+        if image_list_widget is not None:
+            image_list_widget.refresh_image_state(self.image_manager)
+    
     def mouseMoveEvent(self, event):
         """鼠标移动事件"""
-        # 只有当设置了比例时才响应鼠标事件
-        if self.aspect_ratio is None:
+        # 只有当设置了比例且图像已加载时才响应鼠标事件
+        if self.aspect_ratio is None or self.scaled_pixmap is None:
             return
             
         if self.is_selecting and self.image_manager:
-            # 更新矩形位置，使裁切框中心跟随鼠标移动
-            self._update_rectangle_position(event.pos())
-            self.update()
+            # 记录最新位置，高回报率鼠标下每帧最多更新一次裁切框
+            self._pending_mouse_pos = event.pos()
+            if not self._move_timer.isActive():
+                self._move_timer.start(self.MOVE_INTERVAL)
+    
+    def _flush_move(self):
+        """处理最近一次鼠标移动，使裁切框中心跟随鼠标移动"""
+        pos = self._pending_mouse_pos
+        self._pending_mouse_pos = None
+        if pos is None or not self.is_selecting or not self.image_manager:
+            return
+        old_rect = QRect(self.rectangle)
+        self._update_rectangle_position(pos)
+        self._update_rect_region(old_rect)
+    
+    def _update_rect_region(self, old_rect):
+        """只重绘裁切框移动前后覆盖的区域（包含边框和控制点的外延）"""
+        self.update(self.rectangle.united(old_rect).adjusted(-4, -4, 4, 4))
     
     def _update_rectangle_position(self, pos):
         """更新矩形位置，确保矩形始终在图像范围内"""
-        if not self.scaled_pixmap or not self.scaled_pixmap.isNull():
-            img_width = self.scaled_pixmap.width()
-            img_height = self.scaled_pixmap.height()
-            
-            # 计算图像在标签中的偏移量
-            x_offset = (self.width() - img_width) // 2
-            y_offset = (self.height() - img_height) // 2
-            
-            # 计算新的矩形中心点
-            center_x = max(x_offset, min(pos.x(), x_offset + img_width))
-            center_y = max(y_offset, min(pos.y(), y_offset + img_height))
-            
-            # 更新矩形位置（保持大小不变）
-            new_x = center_x - self.rectangle.width() // 2
-            new_y = center_y - self.rectangle.height() // 2
-            
-            # 确保矩形不超出图像范围
-            new_x = max(x_offset, min(new_x, x_offset + img_width - self.rectangle.width()))
-            new_y = max(y_offset, min(new_y, y_offset + img_height - self.rectangle.height()))
-            
-            self.rectangle = QRect(new_x, new_y, self.rectangle.width(), self.rectangle.height())
+        if self.scaled_pixmap is None or self.scaled_pixmap.isNull():
+            return
+        
+        img_width = self.scaled_pixmap.width()
+        img_height = self.scaled_pixmap.height()
+        
+        # 计算图像在标签中的偏移量
+        x_offset = (self.width() - img_width) // 2
+        y_offset = (self.height() - img_height) // 2
+        
+        # 计算新的矩形中心点
+        center_x = max(x_offset, min(pos.x(), x_offset + img_width))
+        center_y = max(y_offset, min(pos.y(), y_offset + img_height))
+        
+        # 更新矩形位置（保持大小不变）
+        new_x = center_x - self.rectangle.width() // 2
+        new_y = center_y - self.rectangle.height() // 2
+        
+        # 确保矩形不超出图像范围
+        new_x = max(x_offset, min(new_x, x_offset + img_width - self.rectangle.width()))
+        new_y = max(y_offset, min(new_y, y_offset + img_height - self.rectangle.height()))
+        
+        self.rectangle = QRect(new_x, new_y, self.rectangle.width(), self.rectangle.height())
     
     def mouseReleaseEvent(self, event):
         """鼠标释放事件"""
-        if event.button() == Qt.LeftButton and self.is_selecting:
+        if self._interactive:
+            self._end_interactive()
+        
+        if event.button() == Qt.LeftButton and self.is_selecting and self.scaled_pixmap is not None:
             # 左键释放，确认选择
             self.is_selecting = False
             
@@ -447,21 +841,23 @@ class CropImageDisplay(BaseImageDisplay):
             if self.image_manager:
                 source_rect = self._get_source_rect()
                 self.image_manager.set_crop((source_rect.x(), source_rect.y(), source_rect.width(), source_rect.height()))
+                self._notify_state_changed()
                 
                 # 保存最后操作的尺寸和位置
-                img_path = self.image_manager.image_path
-                self.last_rect_size[img_path] = self.rect_size
-                self.last_rect_pos[img_path] = self.rectangle
+                self._save_crop_history(self.image_manager.image_path, self.rect_size)
             
             self.update()
     
     def wheelEvent(self, event):
         """鼠标滚轮事件，用于缩放矩形"""
-        # 只有当设置了比例时才响应鼠标滚轮事件
-        if self.aspect_ratio is None:
+        # 只有当设置了比例且图像已加载时才响应鼠标滚轮事件
+        if self.aspect_ratio is None or self.scaled_pixmap is None:
             return
             
         if self.is_selecting and self.image_manager:
+            self._interactive = True
+            self._wheel_timer.start(150)
+            
             # 获取滚轮角度
             angle_delta = event.angleDelta().y()
             
@@ -494,10 +890,11 @@ class CropImageDisplay(BaseImageDisplay):
             new_y = max(y_offset, min(new_y, y_offset + img_height - new_height))
             
             # 更新矩形和大小
+            old_rect = self.rectangle
             self.rectangle = QRect(new_x, new_y, new_width, new_height)
             self.rect_size = max(new_width, new_height)  # 更新长边大小
             
-            self.update()
+            self._update_rect_region(old_rect)
     
     def reset(self):
         """重置组件状态"""
@@ -507,18 +904,22 @@ class CropImageDisplay(BaseImageDisplay):
 
 class ResizeImageDisplay(BaseImageDisplay):
     """缩放模式图像显示组件，显示裁切后的图像"""
+    _PEN_BLUE2 = QPen(Qt.blue, 2, Qt.SolidLine)  # 裁切区域边框
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._crop_cache_key = None  # 裁切缓存对应的(roi, 宽, 高, 原图标识)
+        self._crop_cache_pixmap = None  # 裁切并缩放后的图像缓存
+    
     def paintEvent(self, event):
         """重绘事件，显示裁切后的图像"""
-        super().paintEvent(event)
+        painter = self._begin_paint(event)
         
         if self.scaled_pixmap and not self.scaled_pixmap.isNull() and self.image_manager:
-            painter = QPainter(self)
-            
             # 如果有裁切区域，绘制裁切后的图像
             if self.image_manager.roi:
                 # 获取原始图像中的裁切区域
                 x, y, w, h = self.image_manager.roi
-                source_rect = QRect(x, y, w, h)
                 
                 # 计算裁切后图像的缩放尺寸
                 scale_x = self.width() / w
@@ -531,108 +932,112 @@ class ResizeImageDisplay(BaseImageDisplay):
                 x_pos = (self.width() - scaled_width) // 2
                 y_pos = (self.height() - scaled_height) // 2
                 
+                # 裁切区域或组件尺寸变化时才重新裁切缩放，否则直接绘制缓存
+                key = (self.image_manager.roi, self.width(), self.height(), self.original_pixmap.cacheKey())
+                if key != self._crop_cache_key:
+                    cropped = self.original_pixmap.copy(x, y, w, h)
+                    self._crop_cache_pixmap = cropped.scaled(
+                        scaled_width, scaled_height,
+                        Qt.KeepAspectRatio,
+                        Qt.SmoothTransformation
+                    )
+                    self._crop_cache_key = key
+                
                 # 绘制裁切后的图像
-                painter.drawPixmap(QRect(x_pos, y_pos, scaled_width, scaled_height), 
-                                  self.original_pixmap, source_rect)
+                painter.drawPixmap(x_pos, y_pos, self._crop_cache_pixmap)
                 
                 # 绘制裁切区域的边框
-                pen = QPen(Qt.blue, 2, Qt.SolidLine)
-                painter.setPen(pen)
+                painter.setPen(self._PEN_BLUE2)
                 painter.drawRect(x_pos, y_pos, scaled_width, scaled_height)
             else:
                 # 没有裁切区域，正常绘制整个图像
                 x = (self.width() - self.scaled_pixmap.width()) // 2
                 y = (self.height() - self.scaled_pixmap.height()) // 2
                 painter.drawPixmap(x, y, self.scaled_pixmap)
+    
+    def reset(self):
+        """重置组件状态"""
+        super().reset()
+        self._crop_cache_key = None
+        self._crop_cache_pixmap = None
 
 class MarkImageDisplay(BaseImageDisplay):
     """打标模式图像显示组件，显示裁切和缩放后的图像"""
+    _DOT_PIXMAP = None  # 标记点图案，所有实例共享
+    _PEN_BLUE1 = QPen(Qt.blue, 1, Qt.SolidLine)  # 标记文本
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.marks = []  # 存储打标位置和内容
+        self._text_pixmaps = {}  # 标记文本的预渲染图案 {(text, 设备像素比): (pixmap, 相对基线的包围矩形)}
     
     def paintEvent(self, event):
         """重绘事件，显示处理后的图像和打标"""
-        super().paintEvent(event)
+        painter = self._begin_paint(event)
+        painter.setRenderHint(QPainter.Antialiasing)
         
-        if self.scaled_pixmap and not self.scaled_pixmap.isNull() and self.image_manager:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            # 获取处理后的图像显示区域
-            display_rect = self._get_processed_image_rect()
-            
-            if display_rect.isValid():
-                # 根据处理状态绘制不同的图像
-                if self.image_manager.is_resized:
-                    # 如果有缩放，显示缩放后的图像
-                    # 这里简化处理，实际应从image_manager获取处理后的图像数据
-                    pass
-                elif self.image_manager.is_croped:
-                    # 如果有裁切，显示裁切后的图像
-                    x, y, w, h = self.image_manager.roi
-                    source_rect = QRect(x, y, w, h)
-                    painter.drawPixmap(display_rect, self.original_pixmap, source_rect)
-                else:
-                    # 否则显示原始图像
-                    painter.drawPixmap(
-                        (self.width() - self.scaled_pixmap.width()) // 2,
-                        (self.height() - self.scaled_pixmap.height()) // 2,
-                        self.scaled_pixmap
-                    )
-                
-                # 绘制打标
-                self._draw_marks(painter, display_rect)
-    
-    def _get_processed_image_rect(self):
-        """计算处理后图像的显示区域"""
-        if not self.scaled_pixmap or not self.scaled_pixmap.isNull():
-            img_width = self.scaled_pixmap.width()
-            img_height = self.scaled_pixmap.height()
-            
-            # 如果有裁切，调整图像大小
-            if self.image_manager and self.image_manager.roi:
-                x, y, w, h = self.image_manager.roi
-                # 计算原始图像到显示图像的缩放比例
-                scale_x = self.scaled_pixmap.width() / self.original_pixmap.width()
-                scale_y = self.scaled_pixmap.height() / self.original_pixmap.height()
-                
-                # 计算显示区域中的裁切矩形
-                display_x = (self.width() - self.scaled_pixmap.width()) // 2 + int(x * scale_x)
-                display_y = (self.height() - self.scaled_pixmap.height()) // 2 + int(y * scale_y)
-                display_width = int(w * scale_x)
-                display_height = int(h * scale_y)
-                
-                # 计算居中显示的缩放比例
-                scale = min(self.width() / display_width, self.height() / display_height)
-                new_width = int(display_width * scale)
-                new_height = int(display_height * scale)
-                
-                return QRect(
-                    (self.width() - new_width) // 2,
-                    (self.height() - new_height) // 2,
-                    new_width,
-                    new_height
-                )
-            else:
-                # 没有裁切，返回原图像居中显示的区域
-                x = (self.width() - self.scaled_pixmap.width()) // 2
-                y = (self.height() - self.scaled_pixmap.height()) // 2
-                return QRect(x, y, self.scaled_pixmap.width(), self.scaled_pixmap.height())
-        return QRect()
+        display_rect = self._draw_processed_image(painter)
+        if display_rect.isValid():
+            # 绘制打标
+            self._draw_marks(painter, display_rect)
     
     def _draw_marks(self, painter, display_rect):
-        """绘制打标"""
-        for mark in self.marks:
-            x, y, text = mark
-            # 绘制标记点
-            pen = QPen(Qt.red, 5, Qt.SolidLine)
-            painter.setPen(pen)
-            painter.drawPoint(x, y)
-            
-            # 绘制标记文本
-            painter.setPen(QPen(Qt.blue, 1, Qt.SolidLine))
-            painter.drawText(x + 10, y - 10, text)
+        """绘制打标，标记点和同内容的文本各用一次批量贴图完成"""
+        if not self.marks:
+            return
+        
+        # 绘制标记点
+        dot = self._get_dot_pixmap()
+        dot_source = QRectF(dot.rect())
+        painter.drawPixmapFragments(
+            [QPainter.PixmapFragment.create(QPointF(x, y), dot_source) for x, y, _ in self.marks],
+            dot
+        )
+        
+        # 绘制标记文本，按内容分组
+        fragments = {}
+        for x, y, text in self.marks:
+            fragments.setdefault(text, []).append((x, y))
+        dpr = self.devicePixelRatioF()
+        scale = 1 / dpr  # 图案按物理像素绘制，贴图时缩回逻辑尺寸
+        for text, points in fragments.items():
+            pixmap, bounds = self._get_text_pixmap(text, dpr)
+            source = QRectF(pixmap.rect())
+            # 文本基线位于标记点右上方 (x + 10, y - 10)
+            offset_x = 10 + bounds.x() + bounds.width() / 2
+            offset_y = -10 + bounds.y() + bounds.height() / 2
+            painter.drawPixmapFragments(
+                [QPainter.PixmapFragment.create(QPointF(x + offset_x, y + offset_y), source, scale, scale)
+                 for x, y in points],
+                pixmap
+            )
+    
+    @classmethod
+    def _get_dot_pixmap(cls):
+        """获取标记点图案（5x5红色方块），首次使用时创建"""
+        if cls._DOT_PIXMAP is None:
+            pixmap = QPixmap(5, 5)
+            pixmap.fill(Qt.red)
+            cls._DOT_PIXMAP = pixmap
+        return cls._DOT_PIXMAP
+    
+    def _get_text_pixmap(self, text, dpr):
+        """获取标记文本的预渲染图案，首次使用时按当前字体和设备像素比绘制"""
+        key = (text, dpr)
+        entry = self._text_pixmaps.get(key)
+        if entry is None:
+            bounds = self.fontMetrics().boundingRect(text)
+            pixmap = QPixmap(max(round(bounds.width() * dpr), 1), max(round(bounds.height() * dpr), 1))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.font())
+            painter.setPen(self._PEN_BLUE1)
+            painter.drawText(-bounds.x(), -bounds.y(), text)
+            painter.end()
+            entry = (pixmap, bounds)
+            self._text_pixmaps[key] = entry
+        return entry
     
     def add_mark(self, pos, text):
         """添加一个打标"""
@@ -657,75 +1062,16 @@ class MarkImageDisplay(BaseImageDisplay):
 
 class CorrectImageDisplay(BaseImageDisplay):
     """修正模式图像显示组件，显示裁切和缩放后图像"""
+    _PEN_GREEN1 = QPen(Qt.green, 1, Qt.SolidLine)  # 提示文字
+    
     def paintEvent(self, event):
         """重绘事件，显示处理后的图像"""
-        super().paintEvent(event)
+        painter = self._begin_paint(event)
         
-        if self.scaled_pixmap and not self.scaled_pixmap.isNull() and self.image_manager:
-            painter = QPainter(self)
-            
-            # 获取处理后的图像显示区域
-            display_rect = self._get_processed_image_rect()
-            
-            if display_rect.isValid():
-                # 根据处理状态绘制不同的图像
-                if self.image_manager.is_resized:
-                    # 如果有缩放，显示缩放后的图像
-                    # 这里简化处理，实际应从image_manager获取处理后的图像数据
-                    pass
-                elif self.image_manager.is_croped:
-                    # 如果有裁切，显示裁切后的图像
-                    x, y, w, h = self.image_manager.roi
-                    source_rect = QRect(x, y, w, h)
-                    painter.drawPixmap(display_rect, self.original_pixmap, source_rect)
-                else:
-                    # 否则显示原始图像
-                    painter.drawPixmap(
-                        (self.width() - self.scaled_pixmap.width()) // 2,
-                        (self.height() - self.scaled_pixmap.height()) // 2,
-                        self.scaled_pixmap
-                    )
-                
-                # 绘制修正模式的提示信息
-                painter.setPen(QPen(Qt.green, 1, Qt.SolidLine))
-                painter.drawText(10, 20, "修正模式：显示最终处理后的图像")
-    
-    def _get_processed_image_rect(self):
-        """计算处理后图像的显示区域"""
-        if not self.scaled_pixmap or not self.scaled_pixmap.isNull():
-            img_width = self.scaled_pixmap.width()
-            img_height = self.scaled_pixmap.height()
-            
-            # 如果有裁切，调整图像大小
-            if self.image_manager and self.image_manager.roi:
-                x, y, w, h = self.image_manager.roi
-                # 计算原始图像到显示图像的缩放比例
-                scale_x = self.scaled_pixmap.width() / self.original_pixmap.width()
-                scale_y = self.scaled_pixmap.height() / self.original_pixmap.height()
-                
-                # 计算显示区域中的裁切矩形
-                display_x = (self.width() - self.scaled_pixmap.width()) // 2 + int(x * scale_x)
-                display_y = (self.height() - self.scaled_pixmap.height()) // 2 + int(y * scale_y)
-                display_width = int(w * scale_x)
-                display_height = int(h * scale_y)
-                
-                # 计算居中显示的缩放比例
-                scale = min(self.width() / display_width, self.height() / display_height)
-                new_width = int(display_width * scale)
-                new_height = int(display_height * scale)
-                
-                return QRect(
-                    (self.width() - new_width) // 2,
-                    (self.height() - new_height) // 2,
-                    new_width,
-                    new_height
-                )
-            else:
-                # 没有裁切，返回原图像居中显示的区域
-                x = (self.width() - self.scaled_pixmap.width()) // 2
-                y = (self.height() - self.scaled_pixmap.height()) // 2
-                return QRect(x, y, self.scaled_pixmap.width(), self.scaled_pixmap.height())
-        return QRect()
+        if self._draw_processed_image(painter).isValid():
+            # 绘制修正模式的提示信息
+            painter.setPen(self._PEN_GREEN1)
+            painter.drawText(10, 20, "修正模式：显示最终处理后的图像")
 
 class ModeDisplayManager:
     """图像显示组件管理器，负责管理不同模式的图像显示组件"""
@@ -733,76 +1079,66 @@ class ModeDisplayManager:
         self.app = app
         self.current_mode = None
         self.display_widget = None
+        self.stack = None  # 放置各模式显示组件的堆叠容器
         self.components = {}
+        self._indices = {}  # 各模式组件在堆叠容器中的索引
         self.image_manager = None
         
         # 初始化各种模式的图像显示组件
         self._init_components()
     
     def _init_components(self):
-        """初始化各种模式的图像显示组件"""
-        self.components['empty'] = EmptyImageDisplay(self.app)
-        self.components['empty'].hide()
-        self.components['empty'].on_exit_mode()
-
-        self.components['browse'] = DefaultImageDisplay(self.app)
-        self.components['browse'].hide()
-        self.components['browse'].on_exit_mode()
-
-        self.components['crop'] = CropImageDisplay(self.app)
-        self.components['crop'].hide()
-        self.components['crop'].on_exit_mode()
-
-        self.components['resize'] = ResizeImageDisplay(self.app)
-        self.components['resize'].hide()
-        self.components['resize'].on_exit_mode()
-
-        self.components['mark'] = MarkImageDisplay(self.app)
-        self.components['mark'].hide()
-        self.components['mark'].on_exit_mode()
-        
-        self.components['correct'] = CorrectImageDisplay(self.app)
-        self.components['correct'].hide()
-        self.components['correct'].on_exit_mode()
+        """登记各种模式的图像显示组件类型，组件在首次切换到该模式时才创建"""
+        self._component_classes = {
+            'empty': EmptyImageDisplay,
+            'browse': DefaultImageDisplay,
+            'crop': CropImageDisplay,
+            'resize': ResizeImageDisplay,
+            'mark': MarkImageDisplay,
+            'correct': CorrectImageDisplay
+        }
+    
+    def _get_component(self, mode):
+        """获取指定模式的显示组件，不存在时创建"""
+        if mode not in self.components:
+            component = self._component_classes[mode](self.app)
+            component.hide()
+            component.on_exit_mode()
+            self.components[mode] = component
+            self._attach_component(mode)
+        return self.components[mode]
+    
+    def _attach_component(self, mode):
+        """将模式组件加入堆叠容器，每个组件只添加一次"""
+        if self.stack is not None and mode not in self._indices:
+            self._indices[mode] = self.stack.addWidget(self.components[mode])
     
     def set_display_widget(self, display_widget):
-        """设置图像显示容器"""
+        """设置图像显示容器，在其中创建堆叠容器放置各模式的组件"""
         self.display_widget = display_widget
+        self.stack = QStackedWidget(display_widget)
+        display_widget.layout().addWidget(self.stack)
+        for mode in self.components:
+            self._attach_component(mode)
     
     def set_mode(self, mode):
         """切换到指定模式的图像显示组件"""
-        if mode in self.components:
-            # 如果当前有活跃的组件，先隐藏它
+        if mode in self._component_classes:
+            # 如果当前有活跃的组件，先执行它的退出回调
             if self.current_mode and self.current_mode in self.components:
-                self.components[self.current_mode].hide()
                 self.components[self.current_mode].on_exit_mode()
             
-            # 显示新模式的组件
+            # 切换到新模式的组件，隐藏的组件不会收到绘制和尺寸变化事件
             self.current_mode = mode
-            current_component = self.components[mode]
-            
-            # 如果显示容器存在，添加组件到容器
-            if self.display_widget:
-                layout = self.display_widget.layout()
-                if layout is not None:
-                    # 清空布局中的所有组件
-                    while layout.count() > 0:
-                        item = layout.takeAt(0)
-                        widget = item.widget()
-                        if widget:
-                            widget.hide()
-                            layout.removeWidget(widget)
-                    
-                    # 添加新模式的组件到布局
-                    layout.addWidget(current_component)
-            
-            # 设置图像
-            if self.image_manager:
-                current_component.set_image(self.image_manager)
+            current_component = self._get_component(mode)
+            if self.stack is not None:
+                self.stack.setCurrentIndex(self._indices[mode])
             
-            # 显示组件
-            current_component.show()
-            current_component.on_enter_mode()
+            # 设置图像和进入模式回调中的多次刷新合并为一次重绘
+            with current_component._suspend_updates():
+                if self.image_manager:
+                    current_component.set_image(self.image_manager)
+                current_component.on_enter_mode()
     
     def set_image(self, image_manager):
         """设置要显示的图像"""
@@ -811,6 +1147,12 @@ class ModeDisplayManager:
         if self.current_mode and self.current_mode in self.components:
             self.components[self.current_mode].set_image(image_manager)
     
+    def prefetch(self, image_managers):
+        """在后台预先解码可能即将查看的图像，切换到这些图像时可直接从缓存显示"""
+        loader = _get_image_loader()
+        for image_manager in image_managers:
+            loader.load(image_manager.image_path)
+    
     def reset(self):
         """重置所有组件"""
         for component in self.components.values():
@@ -820,9 +1162,4 @@ class ModeDisplayManager:
         """获取当前模式的组件"""
         if self.current_mode and self.current_mode in self.components:
             return self.components[self.current_mode]
-        return None
-    
-    def resizeEvent(self, event):
-        """窗口大小变化事件"""
-        if self.current_mode and self.current_mode in self.components:
-            self.components[self.current_mode].resizeEvent(event)
\ No newline at end of file
+        return None
\ No newline at end of file
@@ -1,12 +1,32 @@
-from abc import ABC, abstractmethod
-from abc import ABC, abstractmethod
+import os
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QLineEdit, QFrame, QFileDialog, QTextEdit, QSizePolicy
+    QLineEdit, QFrame, QSizePolicy, QMessageBox
 )
 from PyQt5.QtCore import Qt
+from data_utils import ImageDataManager
 
-class BaseOptMode(ABC):
+def make_separator(shape=QFrame.HLine):
+    """创建凹陷样式的分隔线，shape 为 QFrame.HLine 或 QFrame.VLine"""
+    separator = QFrame()
+    separator.setFrameShape(shape)
+    separator.setFrameShadow(QFrame.Sunken)
+    return separator
+
+def ask_question(parent, title, text):
+    """显示确认对话框并返回用户的选择，默认选择"否"以防止误操作；每个parent只创建一个对话框并重复使用"""
+    box = parent.findChild(QMessageBox, 'confirm_box', Qt.FindDirectChildrenOnly)
+    if box is None:
+        box = QMessageBox(parent)
+        box.setObjectName('confirm_box')
+        box.setIcon(QMessageBox.Question)
+        box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        box.setDefaultButton(QMessageBox.No)
+    box.setWindowTitle(title)
+    box.setText(text)
+    return box.exec_()
+
+class BaseOptMode:
     """模式基类，定义模式的通用接口"""
     def __init__(self, name, display_name, ui_height, app=None):
         self.name = name  # 模式唯一标识符
@@ -54,12 +74,10 @@ class BaseOptMode(ABC):
         if self.ui_container:
             self.ui_container.hide()
     
-    @abstractmethod
     def on_enter(self):
         """进入模式时执行的操作"""
         pass
     
-    @abstractmethod
     def on_exit(self):
         """退出模式时执行的操作"""
         pass
@@ -70,22 +88,28 @@ class BaseOptMode(ABC):
 
 class CropOptMode(BaseOptMode):
     """裁切模式"""
+    _RATIOS = ('1:1', '3:4', '4:3', '9:16', '16:9')  # 可选的裁切比例
+    
     def __init__(self, app=None):
         super().__init__('crop', '裁切', 60,app)
         self.ratio_combo = None
+        self._set_aspect_ratio = None  # 当前显示组件的 set_aspect_ratio，首次使用时查找
     
     def get_ui_layout(self):
         """获取裁切模式特有的UI布局"""
+        # 只在该模式首次创建UI时用到，延迟导入
+        from PyQt5.QtWidgets import QComboBox
+        
         layout = QHBoxLayout()
         
         # 裁切比例标签和下拉框
         ratio_label = QLabel('裁切比例:')
         self.ratio_combo = QComboBox()
-        self.ratio_combo.addItems(['1:1', '3:4', '4:3', '9:16', '16:9'])
+        self.ratio_combo.addItems(self._RATIOS)
         self.add_ui_component(self.ratio_combo)
         
-        # 连接比例变化信号
-        self.ratio_combo.currentTextChanged.connect(self.on_ratio_changed)
+        # 连接比例变化信号，按索引取比例，避免每次传递字符串
+        self.ratio_combo.currentIndexChanged[int].connect(self.on_ratio_index_changed)
 
         # 添加到主布局
         layout.addWidget(ratio_label)
@@ -93,14 +117,22 @@ class CropOptMode(BaseOptMode):
         
         return layout
     
+    def on_ratio_index_changed(self, index):
+        """处理比例下拉框的索引变化事件"""
+        if 0 <= index < len(self._RATIOS):
+            self.on_ratio_changed(self._RATIOS[index])
+    
     def on_ratio_changed(self, ratio_str):
         """处理比例变化事件"""
-        if self.app:
-            # 通过app的mode_manager获取当前显示组件
-            if hasattr(self.app, 'mode_manager'):
+        set_aspect_ratio = self._set_aspect_ratio
+        if set_aspect_ratio is None:
+            # 进入模式时显示组件可能尚未切换，因此在首次变化时查找并缓存
+            if self.app and hasattr(self.app, 'mode_manager'):
                 display_component = self.app.mode_manager.get_current_display_component()
-                if display_component and hasattr(display_component, 'set_aspect_ratio'):
-                    display_component.set_aspect_ratio(ratio_str)
+                set_aspect_ratio = getattr(display_component, 'set_aspect_ratio', None)
+                self._set_aspect_ratio = set_aspect_ratio
+        if set_aspect_ratio:
+            set_aspect_ratio(ratio_str)
     
     def on_enter(self):
         if self.app:
@@ -108,17 +140,24 @@ class CropOptMode(BaseOptMode):
                 '矩形框实时跟随鼠标，左键确定区域，右键取消，滚轮缩放')
             # 初始化比例
             if hasattr(self.app, 'mode_manager'):
-                current_ratio = self.ratio_combo.currentText()
+                current_ratio = self._RATIOS[self.ratio_combo.currentIndex()]
                 display_component = self.app.mode_manager.get_current_display_component()
                 if display_component and hasattr(display_component, 'set_aspect_ratio'):
                     display_component.set_aspect_ratio(current_ratio)
         self.show_ui()
     
     def on_exit(self):
+        self._set_aspect_ratio = None
         self.hide_ui()
     
 class ResizeOptMode(BaseOptMode):
     """缩放模式"""
+    # 输入框定义：(标签文本, 属性名, 占位提示)
+    _EDITS = (
+        ('宽:', 'width_edit', '输入宽度'),
+        ('高:', 'height_edit', '输入高度'),
+    )
+    
     def __init__(self, app=None):
         super().__init__('resize', '缩放', 120, app)
         self.width_edit = None
@@ -130,17 +169,14 @@ class ResizeOptMode(BaseOptMode):
         """获取缩放模式特有的UI布局"""
         layout = QHBoxLayout()
         
-        # 宽度输入
-        width_label = QLabel('宽:')
-        self.width_edit = QLineEdit()
-        self.width_edit.setPlaceholderText('输入宽度')
-        self.add_ui_component(self.width_edit)
-        
-        # 高度输入
-        height_label = QLabel('高:')
-        self.height_edit = QLineEdit()
-        self.height_edit.setPlaceholderText('输入高度')
-        self.add_ui_component(self.height_edit)
+        # 宽度和高度输入
+        for label_text, name, placeholder in self._EDITS:
+            edit = QLineEdit()
+            edit.setPlaceholderText(placeholder)
+            setattr(self, name, edit)
+            self.add_ui_component(edit)
+            layout.addWidget(QLabel(label_text))
+            layout.addWidget(edit)
         
         # 按钮
         button_layout = QVBoxLayout()
@@ -155,10 +191,6 @@ class ResizeOptMode(BaseOptMode):
         button_layout.addWidget(self.cancel_button)
         
         # 添加到主布局
-        layout.addWidget(width_label)
-        layout.addWidget(self.width_edit)
-        layout.addWidget(height_label)
-        layout.addWidget(self.height_edit)
         layout.addStretch(1)
         layout.addLayout(button_layout)
         
@@ -175,12 +207,12 @@ class ResizeOptMode(BaseOptMode):
     def perform_action(self, param=None, option=None):
         """执行缩放操作"""
         if self.app:
-            selected_images = self.app.image_list_widget.get_selected_images()
-            if selected_images:
+            selected_rows = self.app.image_list_widget.get_selected_rows()
+            if selected_rows:
                 width = self.width_edit.text() if self.width_edit else ''
                 height = self.height_edit.text() if self.height_edit else ''
-                for img in selected_images:
-                    img.state |= img.STATE_RESIZE  # 使用ImageDataManager的STATE_RESIZE
+                # 所有选中图像的状态一次性批量修改，表格只刷新状态列
+                self.app.image_list_widget.or_states(selected_rows, ImageDataManager.STATE_RESIZE)
                 return True, f'{self.display_name}处理完成，尺寸: {width}x{height}'
             else:
                 return False, '请先选择要处理的图像'
@@ -188,6 +220,13 @@ class ResizeOptMode(BaseOptMode):
 
 class MarkOptMode(BaseOptMode):
     """打标模式"""
+    # 推理控制按钮定义：(按钮文本, 属性名, 槽函数名)
+    _CTRL_BUTTONS = (
+        ('重新推理', 'retry_button', '_on_retry'),
+        ('继续推理', 'continue_button', '_on_continue'),
+        ('停止推理', 'stop_button', '_on_stop'),
+    )
+    
     def __init__(self, app=None):
         super().__init__('mark', '打标', 120, app)
         self.model_path_label = None
@@ -214,19 +253,13 @@ class MarkOptMode(BaseOptMode):
         
         # 推理控制按钮
         control_layout = QVBoxLayout()
-        self.retry_button = QPushButton('重新推理')
-        self.continue_button = QPushButton('继续推理')
-        self.stop_button = QPushButton('停止推理')
-        
-        # 连接信号
-        if self.app:
-            self.retry_button.clicked.connect(lambda: self.perform_action('retry'))
-            self.continue_button.clicked.connect(lambda: self.perform_action('continue'))
-            self.stop_button.clicked.connect(lambda: self.perform_action('stop'))
-        
-        control_layout.addWidget(self.retry_button)
-        control_layout.addWidget(self.continue_button)
-        control_layout.addWidget(self.stop_button)
+        for text, name, slot in self._CTRL_BUTTONS:
+            button = QPushButton(text)
+            setattr(self, name, button)
+            # 连接信号
+            if self.app:
+                button.clicked.connect(getattr(self, slot))
+            control_layout.addWidget(button)
         
         # 添加到主布局
         layout.addLayout(select_model_layout)
@@ -235,12 +268,31 @@ class MarkOptMode(BaseOptMode):
         
         return layout
     
+    def _on_retry(self):
+        """重新推理按钮的槽函数"""
+        return self.perform_action('retry')
+    
+    def _on_continue(self):
+        """继续推理按钮的槽函数"""
+        return self.perform_action('continue')
+    
+    def _on_stop(self):
+        """停止推理按钮的槽函数"""
+        return self.perform_action('stop')
+    
     def select_model(self):
         """选择模型文件夹"""
-        directory = QFileDialog.getExistingDirectory(self.app, "选择模型文件夹")
+        from PyQt5.QtWidgets import QFileDialog
+        
+        # 使用Qt自带的对话框，避免部分平台原生对话框枚举文件系统和目录图标时长时间卡顿；
+        # 从上次选择的目录打开，无需重新遍历用户主目录
+        directory = QFileDialog.getExistingDirectory(
+            self.app, "选择模型文件夹", self.model_path,
+            QFileDialog.ShowDirsOnly | QFileDialog.DontUseNativeDialog | QFileDialog.DontUseCustomDirectoryIcons
+        )
         if directory:
             self.model_path = directory
-            self.model_path_label.setText(f'已选择模型: {directory.split("/")[-1]}')
+            self.model_path_label.setText(f'已选择模型: {os.path.basename(os.path.normpath(directory))}')
     
     def on_enter(self):
         if self.app:
@@ -253,13 +305,13 @@ class MarkOptMode(BaseOptMode):
     def perform_action(self, action_type):
         """执行打标操作"""
         if self.app:
-            selected_images = self.app.image_list_widget.get_selected_images()
+            selected_rows = self.app.image_list_widget.get_selected_rows()
             if not self.model_path:
                 return False, '请先选择模型'
             
-            if selected_images:
-                for img in selected_images:
-                    img.state |= img.STATE_INFER  # 使用ImageDataManager的STATE_INFER
+            if selected_rows:
+                # 所有选中图像的状态一次性批量修改，表格只刷新状态列
+                self.app.image_list_widget.or_states(selected_rows, ImageDataManager.STATE_INFER)
                 action_text = {
                     'retry': '重新推理',
                     'continue': '继续推理',
@@ -336,6 +388,9 @@ class CorrectOptMode(BaseOptMode):
     
     def get_ui_layout(self):
         """获取修复模式特有的UI布局"""
+        # 只在该模式首次创建UI时用到，延迟导入
+        from PyQt5.QtWidgets import QTextEdit
+        
         layout = QVBoxLayout()
         
         # 文本编辑区域
@@ -400,11 +455,11 @@ class CorrectOptMode(BaseOptMode):
     def perform_apply(self):
         """执行应用修改操作"""
         if self.app:
-            selected_images = self.app.image_list_widget.get_selected_images()
-            if selected_images:
+            selected_rows = self.app.image_list_widget.get_selected_rows()
+            if selected_rows:
                 target_text = self.target_edit.toPlainText()
-                for img in selected_images:
-                    img.state |= img.STATE_FIX  # 使用ImageDataManager的STATE_FIX
+                # 所有选中图像的状态一次性批量修改，表格只刷新状态列
+                self.app.image_list_widget.or_states(selected_rows, ImageDataManager.STATE_FIX)
                 return True, f'{self.display_name}处理完成'
             else:
                 return False, '请先选择要处理的图像'
@@ -427,11 +482,13 @@ class ModeOptManager:
     def __init__(self, app=None):
         self.app = app
         self.modes = {}
+        self._display_names = {}  # 模式名称到显示名称的映射 {mode_name: display_name}
         self.current_mode = None
         
         # UI容器
         self.operation_widget = None
         self.operation_layout = None
+        self.modes_layout = None  # 各模式UI容器所在的布局，首次进入模式时才创建对应UI
         self.empty_state_widget = None
         
         # 初始化所有内置模式
@@ -447,6 +504,7 @@ class ModeOptManager:
         if isinstance(mode, BaseOptMode):
             mode.app = self.app  # 确保模式有应用程序引用
             self.modes[mode.name] = mode
+            self._display_names[mode.name] = mode.display_name
     
     def remove_mode(self, mode_name):
         """删除一个模式"""
@@ -455,36 +513,42 @@ class ModeOptManager:
             if self.current_mode == mode_name:
                 self.exit_current_mode()
             del self.modes[mode_name]
+            self._display_names.pop(mode_name, None)
     
     def set_mode(self, mode_name):
         """设置当前模式"""
         if mode_name in self.modes:
-            # 先退出当前模式
-            if self.current_mode:
-                self.exit_current_mode()
-            
-            # 进入新模式
-            self.current_mode = mode_name
-            mode = self.modes[mode_name]
-            
-            # 隐藏空状态提示
-            if self.empty_state_widget:
-                self.empty_state_widget.hide()
-            
-            # 根据当前模式的ui_height调整操作区高度
-            if hasattr(mode, 'ui_height') and mode.ui_height > 0:
-                self.operation_widget.setMaximumHeight(mode.ui_height)
-                self.operation_widget.setMinimumHeight(mode.ui_height)
-            else:
-                # 如果没有指定高度，则设置为合理的默认值
-                self.operation_widget.setMaximumHeight(120)
-                self.operation_widget.setMinimumHeight(60)
-            
-            # 调用模式特有的进入逻辑
-            mode.on_enter()
-            
-            # 强制重新计算布局
-            self.operation_widget.updateGeometry()
+            # 切换过程中暂停操作区重绘，隐藏/显示/调整高度完成后统一重绘一次
+            self.operation_widget.setUpdatesEnabled(False)
+            try:
+                # 先退出当前模式
+                if self.current_mode:
+                    self.exit_current_mode()
+                
+                # 进入新模式
+                self.current_mode = mode_name
+                mode = self.modes[mode_name]
+                
+                # 隐藏空状态提示
+                if self.empty_state_widget:
+                    self.empty_state_widget.hide()
+                
+                # 根据当前模式的ui_height调整操作区高度
+                if hasattr(mode, 'ui_height') and mode.ui_height > 0:
+                    self._set_operation_height(mode.ui_height, mode.ui_height)
+                else:
+                    # 如果没有指定高度，则设置为合理的默认值
+                    self._set_operation_height(60, 120)
+                
+                # 首次进入模式时才创建其UI组件
+                if mode.ui_container is None:
+                    mode.create_ui(self.modes_layout)
+                
+                # 调用模式特有的进入逻辑
+                mode.on_enter()
+            finally:
+                # 重新启用时Qt会自动安排一次重绘
+                self.operation_widget.setUpdatesEnabled(True)
             
             return True, f'已切换到{mode.display_name}模式'
         return False, f'模式{mode_name}不存在'
@@ -500,11 +564,7 @@ class ModeOptManager:
                 self.empty_state_widget.show()
             
             # 恢复到默认高度，与空状态提示高度一致
-            self.operation_widget.setMaximumHeight(60)
-            self.operation_widget.setMinimumHeight(60)
-            
-            # 强制重新计算布局
-            self.operation_widget.updateGeometry()
+            self._set_operation_height(60, 60)
             
             if self.app:
                 self.app.update_process_info('已退出所有模式')
@@ -512,6 +572,16 @@ class ModeOptManager:
             return True, '已退出当前模式'
         return False, '当前没有激活的模式'
     
+    def _set_operation_height(self, min_height, max_height):
+        """调整操作区高度，只有高度实际变化时才重新计算布局"""
+        widget = self.operation_widget
+        if widget.minimumHeight() == min_height and widget.maximumHeight() == max_height:
+            return
+        widget.setMaximumHeight(max_height)
+        widget.setMinimumHeight(min_height)
+        # 强制重新计算布局
+        widget.updateGeometry()
+    
     def setup_ui(self, parent_layout):
         """设置模式操作区的UI容器"""
         # 创建模式操作区部件
@@ -519,6 +589,8 @@ class ModeOptManager:
         # 移除固定高度限制，允许根据当前模式的ui_height自适应
         self.operation_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.operation_layout = QVBoxLayout(self.operation_widget)
+        # 构建期间暂停重绘，全部子部件添加完成后统一计算一次布局
+        self.operation_widget.setUpdatesEnabled(False)
         
         # 创建空状态提示
         self.empty_state_widget = QLabel('请选择一个操作模式')
@@ -529,14 +601,18 @@ class ModeOptManager:
         self.empty_state_widget.setMaximumHeight(60)
         self.operation_layout.addWidget(self.empty_state_widget)
         
-        # 初始化所有模式的UI组件
-        for mode in self.modes.values():
-            mode.create_ui(self.operation_layout)
+        # 模式的UI组件延迟到首次进入该模式时创建，这里只预留位置，保证位于分隔符之前
+        self.modes_layout = QVBoxLayout()
+        self.modes_layout.setContentsMargins(0, 0, 0, 0)
+        self.operation_layout.addLayout(self.modes_layout)
         
         # 添加分隔符
         separator = self.create_separator()
         self.operation_layout.addWidget(separator)
         
+        self.operation_layout.activate()
+        self.operation_widget.setUpdatesEnabled(True)
+        
         # 添加到父布局
         parent_layout.addWidget(self.operation_widget)
         
@@ -548,13 +624,7 @@ class ModeOptManager:
     
     def create_separator(self, orientation='horizontal'):
         """创建分隔符"""
-        separator = QFrame()
-        if orientation == 'horizontal':
-            separator.setFrameShape(QFrame.HLine)
-        else:
-            separator.setFrameShape(QFrame.VLine)
-        separator.setFrameShadow(QFrame.Sunken)
-        return separator
+        return make_separator(QFrame.HLine if orientation == 'horizontal' else QFrame.VLine)
     
     def get_current_mode(self):
         """获取当前模式"""
@@ -562,9 +632,7 @@ class ModeOptManager:
     
     def get_mode_display_name(self, mode_name):
         """获取模式的显示名称"""
-        if mode_name in self.modes:
-            return self.modes[mode_name].display_name
-        return ''
+        return self._display_names.get(mode_name, '')
     
     def perform_current_mode_action(self, *args, **kwargs):
         """执行当前模式的操作"""
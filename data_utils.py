@@ -1,6 +1,81 @@
+import os
+import struct
 import cv2
 import numpy as np
 
+# 与界面显示保持一致，解码时忽略EXIF方向信息，保证尺寸与文件头中的一致
+IMREAD_FLAGS = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+
+def make_path_key(image_path):
+    """规范化路径并转换为小写，作为图像查重的键（Windows系统路径大小写不敏感）"""
+    return os.path.normpath(image_path).lower()
+
+def _file_ends_with(f, trailer):
+    """检查文件是否以指定的结束标记结尾，用于发现被截断的文件"""
+    f.seek(0, os.SEEK_END)
+    if f.tell() < len(trailer):
+        return False
+    f.seek(-len(trailer), os.SEEK_END)
+    return f.read() == trailer
+
+def read_image_size(image_path):
+    """只读取文件头获取图像尺寸 (width, height)，并检查文件尾是否完整；
+    无法解析或文件可能被截断时返回 None，由调用方完整解码确认"""
+    try:
+        with open(image_path, 'rb') as f:
+            head = f.read(26)
+            # PNG：固定位置的 IHDR 块记录宽高，文件以 IEND 块结尾
+            if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                width, height = struct.unpack('>II', head[16:24])
+                if not _file_ends_with(f, b'IEND\xaeB`\x82'):
+                    return None
+                return (width, height) if width and height else None
+            # GIF：逻辑屏幕宽高，小端序，文件以 ';' 结尾
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                width, height = struct.unpack('<HH', head[6:10])
+                if not _file_ends_with(f, b';'):
+                    return None
+                return (width, height) if width and height else None
+            # BMP：按信息头大小区分旧版 OS/2 格式，高度为负表示自上而下存储
+            if head.startswith(b'BM'):
+                # 文件头记录了文件总大小，实际文件更小说明被截断
+                file_size, = struct.unpack('<I', head[2:6])
+                f.seek(0, os.SEEK_END)
+                if not file_size or f.tell() < file_size:
+                    return None
+                header_size, = struct.unpack('<I', head[14:18])
+                if header_size == 12:
+                    width, height = struct.unpack('<HH', head[18:22])
+                else:
+                    width, height = struct.unpack('<ii', head[18:26])
+                    height = abs(height)
+                return (width, height) if width > 0 and height else None
+            # JPEG：逐段跳过，直到 SOF 段
+            if head.startswith(b'\xff\xd8'):
+                f.seek(2)
+                while True:
+                    if f.read(1) != b'\xff':
+                        return None
+                    marker = f.read(1)
+                    while marker == b'\xff':  # 填充字节
+                        marker = f.read(1)
+                    if not marker:
+                        return None
+                    code = marker[0]
+                    if code == 0x01 or 0xD0 <= code <= 0xD8:  # 无长度字段的标记
+                        continue
+                    length, = struct.unpack('>H', f.read(2))
+                    if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                        height, width = struct.unpack('>xHH', f.read(5))
+                        # 文件应以 EOI 标记结尾
+                        if not _file_ends_with(f, b'\xff\xd9'):
+                            return None
+                        return (width, height) if width and height else None
+                    f.seek(length - 2, 1)
+    except (OSError, struct.error):
+        pass
+    return None
+
 class ImageDataManager:
     # 状态定义（使用二进制位标记，高位到低位表示顺序），最后状态需要多一位
     STATE_NONE   = 0b00000
@@ -11,14 +86,64 @@ class ImageDataManager:
 
     STATE_ORDER = [STATE_CROP, STATE_RESIZE, STATE_INFER, STATE_FIX]
 
-    def __init__(self, image_path: str):
+    OPENCL_MIN_PIXELS = 2_000_000  # 超过该像素数的图像在有OpenCL设备时使用UMat缩放
+
+    def __init__(self, image_path: str, path_key: str = None):
         self.image_path = image_path
-        self.original_img = cv2.imread(image_path)
-        if self.original_img is None:
-            raise ValueError(f"无法加载图像：{image_path}")
-        self.org_height, self.org_width = self.original_img.shape[:2]
+        # 查重用的路径键只计算一次，调用方已计算时直接传入
+        self.path_key = make_path_key(image_path) if path_key is None else path_key
+        # 状态默认保存在自身；加入图像列表后保存在列表的共享状态数组中
+        self._state = self.STATE_NONE
+        self._owner = None  # 持有共享状态数组 _states 的对象
+        self._index = -1  # 在共享状态数组中的位置
+        self._original_img = None  # 解码后的图像，首次访问时才读取
+        # 只从文件头读取尺寸；无法解析或文件可能不完整时完整解码，解码失败抛出ValueError
+        size = read_image_size(image_path)
+        if size is None:
+            self.org_height, self.org_width = self.original_img.shape[:2]
+        else:
+            self.org_width, self.org_height = size
         self.reset()
 
+    @property
+    def original_img(self):
+        """原始图像，首次访问时解码"""
+        if self._original_img is None:
+            img = cv2.imread(self.image_path, IMREAD_FLAGS)
+            if img is None:
+                raise ValueError(f"无法加载图像：{self.image_path}")
+            self._original_img = img
+        return self._original_img
+
+    @property
+    def state(self):
+        if self._owner is None:
+            return self._state
+        return int(self._owner._states[self._index])
+
+    @state.setter
+    def state(self, value):
+        if self._owner is None:
+            self._state = value
+        else:
+            self._owner._states[self._index] = value
+
+    def bind_state(self, owner, index):
+        """把状态保存位置切换到 owner._states[index]，调用方负责先写入当前状态"""
+        self._owner = owner
+        self._index = index
+
+    def unbind_state(self):
+        """把状态从共享数组中取回自身保存"""
+        self._state = self.state
+        self._owner = None
+        self._index = -1
+
+    def unload(self):
+        """释放已解码的图像数据，再次访问时重新读取"""
+        self._original_img = None
+        self._clear_cache()
+
     def reset(self):
         """初始化，清空所有变量和状态"""
         self.state = self.STATE_NONE
@@ -26,17 +151,23 @@ class ImageDataManager:
         self.resize = None
         self.prompt = None
         self.fix_prompt = None
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """清空裁切和缩放结果的缓存"""
+        self._cropped_key = None  # 裁切缓存对应的 roi
+        self._cropped_img = None
+        self._resized_key = None  # 缩放缓存对应的 (roi, resize, interpolation)
+        self._resized_img = None
+        self._umat_key = None  # 设备端图像对应的 roi
+        self._umat = None  # 上传到OpenCL设备的裁切图像
 
     def _update_state(self, new_state):
         """叠加状态：新状态会清除之后的状态，再进行 OR"""
-        # 找到 new_state 在顺序中的位置
-        if new_state in self.STATE_ORDER:
-            idx = self.STATE_ORDER.index(new_state)
-            # 允许保留之前的状态，清空之后的状态
-            keep_mask = sum(self.STATE_ORDER[:idx+1])
-            self.state &= keep_mask
-        # 叠加新状态
-        self.state |= new_state
+        # 状态位按顺序从高到低排列，补码 -new_state 恰好保留 new_state 及更高的位，
+        # 即保留之前的状态、清空之后的状态；STATE_NONE 不清除任何位
+        keep_mask = -new_state if new_state else -1
+        self.state = (self.state & keep_mask) | new_state
 
     @property
     def is_croped(self):
@@ -59,26 +190,56 @@ class ImageDataManager:
         self.resize = None
         self.prompt = None
         self.fix_prompt = None
+        self._clear_cache()
         self._update_state(self.STATE_CROP)
 
     def get_cropped_image(self):
         if self.roi is None:
             return self.original_img
-        x, y, w, h = self.roi
-        return self.original_img[y:y+h, x:x+w]
+        # 裁切区域不变时直接返回缓存的连续内存副本
+        if self._cropped_key != self.roi:
+            x, y, w, h = self.roi
+            self._cropped_img = np.ascontiguousarray(self.original_img[y:y+h, x:x+w])
+            self._cropped_key = self.roi
+        return self._cropped_img
 
     def set_resize(self, resize):
+        # 统一转换为 (width, height) 整数元组，之后每次缩放无需再检查
+        if resize is not None:
+            width, height = resize
+            resize = (int(width), int(height))
+            if resize[0] <= 0 or resize[1] <= 0:
+                raise ValueError(f"无效的缩放尺寸：{resize}")
         self.resize = resize
         self.prompt = None
         self.fix_prompt = None
+        self._resized_key = None
+        self._resized_img = None
         self._update_state(self.STATE_RESIZE)
 
-    def get_resized_image(self, interpolation=cv2.INTER_LINEAR):
+    def get_resized_image(self, interpolation=None):
         img = self.get_cropped_image()
         if self.resize is None:
             return img
-        return cv2.resize(
-            img, self.resize, interpolation=interpolation)
+        if interpolation is None:
+            # 缩小时使用区域插值，质量更好且更快；放大时使用双线性插值
+            new_w, new_h = self.resize
+            old_h, old_w = img.shape[:2]
+            interpolation = cv2.INTER_AREA if new_w * new_h < old_w * old_h else cv2.INTER_LINEAR
+        key = (self.roi, self.resize, interpolation)
+        if self._resized_key != key:
+            if img.shape[0] * img.shape[1] > self.OPENCL_MIN_PIXELS and cv2.ocl.haveOpenCL():
+                # 大图交给OpenCL设备缩放，裁切图像只上传一次
+                if self._umat is None or self._umat_key != self.roi:
+                    self._umat = cv2.UMat(img)
+                    self._umat_key = self.roi
+                self._resized_img = cv2.resize(
+                    self._umat, self.resize, interpolation=interpolation).get()
+            else:
+                self._resized_img = cv2.resize(
+                    img, self.resize, interpolation=interpolation)
+            self._resized_key = key
+        return self._resized_img
 
     def set_infer(self, prompt: str):
         self.prompt = prompt
@@ -90,4 +251,4 @@ class ImageDataManager:
         self._update_state(self.STATE_FIX)
 
     def get_state(self):
-        return format(self.state, '05b')
\ No newline at end of file
+        return f'{self.state:05b}'
\ No newline at end of file
@@ -1,14 +1,23 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import numpy as np
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
-    QHeaderView, QFileDialog, QAbstractItemView, QStyledItemDelegate,
+    QWidget, QVBoxLayout, QTableView,
+    QHeaderView, QFileDialog, QAbstractItemView, QItemDelegate,
     QMessageBox
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPainter, QBrush, QColor
-from data_utils import ImageDataManager
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QPoint, QRectF, QSize, QDir, QDirIterator
+from PyQt5.QtGui import QPainter, QBrush, QColor, QPixmap
+from data_utils import ImageDataManager, make_path_key
+from component_opt_widgets import ask_question
 
-class StatusCircleDelegate(QStyledItemDelegate):
+def _build_state_lookup(table, default_key):
+    """预先计算0-255每个状态值对应的表项：取state最后一个1所在位对应的项，不存在时取default_key的项"""
+    default = table[default_key]
+    return tuple(table.get(state & -state, default) for state in range(256))
+
+class StatusCircleDelegate(QItemDelegate):
     """用于在表格单元格中绘制不同颜色圆圈的代理类"""
     
     # 为不同状态定义不同颜色
@@ -19,45 +28,151 @@ class StatusCircleDelegate(QStyledItemDelegate):
         ImageDataManager.STATE_INFER: QColor(0, 128, 0),     # 绿色 - 推理
         ImageDataManager.STATE_FIX: QColor(255, 0, 0)        # 红色 - 修正
     }
+    # 每种状态的画刷只创建一次，并按状态值建立到显示状态的查找表
+    STATUS_BRUSHES = {state: QBrush(color) for state, color in STATUS_COLORS.items()}
+    STATE_STATUS = _build_state_lookup({state: state for state in STATUS_COLORS}, ImageDataManager.STATE_NONE)
+    # 单元格大小，与状态列宽度和表格行高一致，确保有足够的空间显示圆圈
+    CELL_SIZE = QSize(60, 30)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pixmaps = {}  # (显示状态, 半径, 设备像素比) -> 预先绘制好的圆圈
+    
+    def _get_circle_pixmap(self, status, radius, dpr):
+        """获取预先以抗锯齿绘制好的圆圈，首次使用时绘制并缓存"""
+        key = (status, radius, dpr)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            size = max(1, round(2 * radius * dpr))
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(self.STATUS_BRUSHES[status])
+            painter.setPen(Qt.NoPen)
+            painter.drawEllipse(QRectF(0, 0, size, size))
+            painter.end()
+            pixmap.setDevicePixelRatio(dpr)
+            self._pixmaps[key] = pixmap
+        return pixmap
     
     def paint(self, painter, option, index):
-        # 获取状态值
+        # 获取状态值，查表得到state最后一个1的位置对应的状态
         state = index.data(Qt.UserRole)
         if state is None:
             state = ImageDataManager.STATE_NONE
-        else:
-            # 获取state的最后一个1的位置对应的状态
-            last_bit = state & -state  # 获取最低位的1
-            state = last_bit if last_bit in self.STATUS_COLORS else ImageDataManager.STATE_NONE
-        
-        # 设置抗锯齿
-        painter.setRenderHint(QPainter.Antialiasing)
+        status = self.STATE_STATUS[state]
         
         # 获取单元格的中心位置
         center = option.rect.center()
         radius = min(option.rect.width(), option.rect.height()) // 3
+        if radius <= 0:
+            return
+        dpr = option.widget.devicePixelRatioF() if option.widget is not None else 1.0
         
-        # 选择颜色
-        color = self.STATUS_COLORS.get(state, self.STATUS_COLORS[ImageDataManager.STATE_NONE])
-        
-        # 绘制圆圈
-        painter.setBrush(QBrush(color))
-        painter.setPen(Qt.NoPen)
-        painter.drawEllipse(center, radius, radius)
+        # 绘制预先绘制好的圆圈
+        painter.drawPixmap(center - QPoint(radius, radius), self._get_circle_pixmap(status, radius, dpr))
         
     def sizeHint(self, option, index):
-        # 设置单元格大小提示
-        size = super().sizeHint(option, index)
-        # 确保有足够的空间显示圆圈
-        size.setHeight(30)
-        return size
+        # 单元格大小固定（状态列宽 x 行高），不必查询样式和字体
+        return QSize(self.CELL_SIZE)
+
+class ImageListModel(QAbstractTableModel):
+    """图像列表的数据模型，直接引用ImageListWidget的图像列表，不为每个单元格创建条目对象"""
+    HEADERS = ('编号', '图片名', '状态')
+    
+    def __init__(self, images, parent=None):
+        super().__init__(parent)
+        self.images = images  # 与ImageListWidget.image_list为同一个列表
+        self._id_labels = []  # 按行号缓存的编号文本，只增不减
+        self._ensure_id_labels(len(images))
+    
+    def _ensure_id_labels(self, count):
+        """确保编号文本缓存至少覆盖count行"""
+        id_labels = self._id_labels
+        for row in range(len(id_labels), count):
+            id_labels.append(f'P{row + 1:05d}')
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.images)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            # 编号 - P开头加五位数编号，居中显示
+            if role == Qt.DisplayRole:
+                return self._id_labels[row]
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        elif column == 1:
+            # 图片名 - 从image_path中提取文件名，tooltip显示完整文件路径
+            if role == Qt.DisplayRole:
+                return os.path.basename(self.images[row].image_path)
+            if role == Qt.ToolTipRole:
+                return self.images[row].image_path
+        elif column == 2:
+            # 状态值存储在UserRole中，供代理类显示彩色圆圈
+            if role == Qt.UserRole:
+                return self.images[row].state
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+    
+    def flags(self, index):
+        # 单元格可选中但不可编辑
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+    
+    def append_images(self, new_images):
+        """在末尾追加图像并通知视图"""
+        if not new_images:
+            return
+        start = len(self.images)
+        self._ensure_id_labels(start + len(new_images))
+        self.beginInsertRows(QModelIndex(), start, start + len(new_images) - 1)
+        self.images.extend(new_images)
+        self.endInsertRows()
+    
+    def remove_rows(self, start, end):
+        """删除[start, end]范围内连续行的图像并通知视图"""
+        self.beginRemoveRows(QModelIndex(), start, end)
+        del self.images[start:end + 1]
+        self.endRemoveRows()
+    
+    def clear(self):
+        """删除所有图像并通知视图"""
+        if not self.images:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, len(self.images) - 1)
+        self.images.clear()
+        self.endRemoveRows()
+    
+    def states_changed(self, rows):
+        """通知视图指定行的状态列已变化"""
+        if len(rows):
+            self.dataChanged.emit(self.index(min(rows), 2), self.index(max(rows), 2), [Qt.UserRole])
 
 class ImageListWidget(QWidget):
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+    IMAGE_NAME_FILTERS = ['*' + ext for ext in IMAGE_EXTENSIONS]
+    
     def __init__(self, app=None):
         super().__init__()
         self.image_list = []  # 存储ImageDataManager对象的列表
+        self._path_set = set()  # 已导入图像的路径键（ImageDataManager.path_key），用于快速查重
+        self._states = np.zeros(0, dtype=np.uint8)  # 与image_list一一对应的状态数组，供批量修改状态
         self.app = app
         self.last_selected_index = -1  # 存储最后一次点击的数据项索引
+        self._selecting = False  # 是否正在处理图像选中
         self.init_ui()
     
     def init_ui(self):
@@ -65,9 +180,9 @@ class ImageListWidget(QWidget):
         layout = QVBoxLayout(self)
         
         # 创建图像列表表格
-        self.image_list_table = QTableWidget()
-        self.image_list_table.setColumnCount(3)
-        self.image_list_table.setHorizontalHeaderLabels(['编号', '图片名', '状态'])
+        self.image_list_model = ImageListModel(self.image_list, self)
+        self.image_list_table = QTableView()
+        self.image_list_table.setModel(self.image_list_model)
         
         # 控制每一列的宽度占比
         header = self.image_list_table.horizontalHeader()
@@ -78,7 +193,7 @@ class ImageListWidget(QWidget):
         header.setSectionResizeMode(1, QHeaderView.Stretch)
         # 状态列：固定宽度
         header.setSectionResizeMode(2, QHeaderView.Fixed)
-        self.image_list_table.setColumnWidth(2, 60)
+        self.image_list_table.setColumnWidth(2, StatusCircleDelegate.CELL_SIZE.width())
         
         # 为状态列设置自定义代理，用于显示彩色圆圈
         self.image_list_table.setItemDelegateForColumn(2, StatusCircleDelegate())
@@ -90,11 +205,14 @@ class ImageListWidget(QWidget):
         # 设置单元格不可编辑
         self.image_list_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
-        # 隐藏垂直表头（默认索引列）
-        self.image_list_table.verticalHeader().setVisible(False)
+        # 隐藏垂直表头（默认索引列），所有行使用固定行高，无需逐行计算大小
+        vertical_header = self.image_list_table.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(StatusCircleDelegate.CELL_SIZE.height())
         
         # 连接信号
-        self.image_list_table.cellClicked.connect(self.on_image_selected)
+        self.image_list_table.clicked.connect(self._on_index_clicked)
         
         # 添加到布局
         layout.addWidget(self.image_list_table)
@@ -108,41 +226,40 @@ class ImageListWidget(QWidget):
         if file_names:
             new_images = []
             duplicate_count = 0
+            # 循环中频繁使用的函数和属性先取为局部变量
+            _path_key = make_path_key
+            path_set = self._path_set
             for file_path in file_names:
-                # 规范化路径并转换为小写以进行比较（Windows系统路径大小写不敏感）
-                normalized_file_path = os.path.normpath(file_path).lower()
+                # 与ImageDataManager.path_key使用同一规则计算查重键
+                normalized_file_path = _path_key(file_path)
                 # 检查图像是否已在列表中
-                is_duplicate = False
-                for img in self.image_list:
-                    if os.path.normpath(img.image_path).lower() == normalized_file_path:
-                        is_duplicate = True
-                        break
-                        
-                if not is_duplicate:
-                    try:
-                        # 创建ImageDataManager对象
-                        img_manager = ImageDataManager(file_path)
-                        new_images.append(img_manager)
-                    except ValueError as e:
-                        self._update_info(f'加载图像失败: {str(e)}')
-                        continue
-                else:
+                if normalized_file_path in path_set:
                     duplicate_count += 1
+                    continue
+                try:
+                    # 创建ImageDataManager对象
+                    img_manager = ImageDataManager(file_path, normalized_file_path)
+                except ValueError as e:
+                    self._update_info(f'加载图像失败: {str(e)}')
+                    continue
+                new_images.append(img_manager)
+                path_set.add(normalized_file_path)
             
             if new_images:
                 # 记录导入前图像列表是否为空
                 was_empty = len(self.image_list) == 0
                 # 选中最后一个新增项
                 last_row = len(self.image_list)
-                # 添加新图像到列表
-                self.image_list.extend(new_images)
-                # 更新表格
-                self.update_table()
-                # 如果之前是空模式，切换到默认模式
-                # if was_empty and self.app and hasattr(self.app, 'set_mode'):
-                #     self.app.set_mode('browse')
-                # 触发显示图像信号
-                self.on_image_selected(last_row, 0)
+                # 插入新行、同步状态和选中新行期间暂停表格重绘，结束后只重绘一次
+                with self._suspended_repaint():
+                    # 添加新图像到列表，并通知表格新增的行
+                    self.image_list_model.append_images(new_images)
+                    self.update_table()
+                    # 如果之前是空模式，切换到默认模式
+                    # if was_empty and self.app and hasattr(self.app, 'set_mode'):
+                    #     self.app.set_mode('browse')
+                    # 触发显示图像信号
+                    self.on_image_selected(last_row, 0)
                 # 更新处理信息
                 message = f'成功导入 {len(new_images)} 张图像'
                 if duplicate_count > 0:
@@ -159,48 +276,42 @@ class ImageListWidget(QWidget):
         folder_path = QFileDialog.getExistingDirectory(self, "选择图像文件夹", "")
         
         if folder_path:
-            image_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.gif']
-            new_images = []
+            candidates = []
             duplicate_count = 0
+            # 循环中频繁使用的函数和属性先取为局部变量
+            _path_key = make_path_key
+            path_set = self._path_set
+            add_path = path_set.add
+            add_candidate = candidates.append
             
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    if any(file.lower().endswith(ext) for ext in image_extensions):
-                        file_path = os.path.join(root, file)
-                        # 规范化路径并转换为小写以进行比较（Windows系统路径大小写不敏感）
-                        normalized_file_path = os.path.normpath(file_path).lower()
-                        # 检查图像是否已在列表中
-                        is_duplicate = False
-                        for img in self.image_list:
-                            if os.path.normpath(img.image_path).lower() == normalized_file_path:
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            try:
-                                # 创建ImageDataManager对象
-                                img_manager = ImageDataManager(file_path)
-                                new_images.append(img_manager)
-                            except ValueError as e:
-                                self._update_info(f'加载图像失败: {str(e)}')
-                                continue
-                        else:
-                            duplicate_count += 1
+            for file_path in self._iter_image_files(folder_path):
+                # 与ImageDataManager.path_key使用同一规则计算查重键
+                normalized_file_path = _path_key(file_path)
+                # 检查图像是否已在列表中
+                if normalized_file_path in path_set:
+                    duplicate_count += 1
+                    continue
+                add_candidate((file_path, normalized_file_path))
+                add_path(normalized_file_path)
+            
+            # 并行创建ImageDataManager对象
+            new_images = self._create_image_managers(candidates)
             
             if new_images:
                 # 记录导入前图像列表是否为空
                 was_empty = len(self.image_list) == 0
                 # 选中最后一个新增项
                 last_row = len(self.image_list)
-                # 添加新图像到列表
-                self.image_list.extend(new_images)
-                # 更新表格
-                self.update_table()
-                # 如果之前是空模式，切换到默认模式
-                # if was_empty and self.app and hasattr(self.app, 'set_mode'):
-                #     self.app.set_mode('browse')
-                # 触发显示图像信号
-                self.on_image_selected(last_row, 0)
+                # 插入新行、同步状态和选中新行期间暂停表格重绘，结束后只重绘一次
+                with self._suspended_repaint():
+                    # 添加新图像到列表，并通知表格新增的行
+                    self.image_list_model.append_images(new_images)
+                    self.update_table()
+                    # 如果之前是空模式，切换到默认模式
+                    # if was_empty and self.app and hasattr(self.app, 'set_mode'):
+                    #     self.app.set_mode('browse')
+                    # 触发显示图像信号
+                    self.on_image_selected(last_row, 0)
                 # 更新处理信息
                 message = f'从文件夹成功导入 {len(new_images)} 张图像'
                 if duplicate_count > 0:
@@ -214,30 +325,43 @@ class ImageListWidget(QWidget):
     
     def delete_image(self):
         """删除选中的图像"""
-        selected_rows = set()
-        for item in self.image_list_table.selectedItems():
-            selected_rows.add(item.row())
+        # 表格按整行选择，每个选中行只返回一个索引
+        selected_rows = {index.row() for index in self.image_list_table.selectionModel().selectedRows()}
         
         if selected_rows:
             # 显示确认对话框
             count = len(selected_rows)
-            reply = QMessageBox.question(
-                self, '确认删除', f'确定要删除选中的 {count} 张图像吗？',
-                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-            )
+            reply = ask_question(self, '确认删除', f'确定要删除选中的 {count} 张图像吗？')
             
             if reply == QMessageBox.Yes:
-                # 从大到小排序，避免索引问题
-                sorted_rows = sorted(selected_rows, reverse=True)
-                last_row = sorted_rows[0]
-                for row in sorted_rows:
-                    # 直接删除列表中的ImageDataManager对象，确保不再保留在内存中
-                    del self.image_list[row]
+                sorted_rows = sorted(selected_rows)
+                last_row = sorted_rows[-1]
+                # 将连续的行合并为区间
+                ranges = []
+                start = prev = sorted_rows[0]
+                for row in sorted_rows[1:]:
+                    if row != prev + 1:
+                        ranges.append((start, prev))
+                        start = row
+                    prev = row
+                ranges.append((start, prev))
                 
-                # 清空选择
-                self.image_list_table.clearSelection()
-                # 更新表格
-                self.update_table()
+                # 逐个区间删除期间暂停表格重绘，结束后只重绘一次
+                with self._suspended_repaint():
+                    # 从后往前按区间删除，避免索引问题
+                    for start, end in reversed(ranges):
+                        for img_manager in self.image_list[start:end + 1]:
+                            # 释放解码数据，外部仍持有该对象时也不再占用图像内存
+                            img_manager.unbind_state()
+                            img_manager.unload()
+                            self._path_set.discard(img_manager.path_key)
+                        # 直接删除列表中的ImageDataManager对象，确保不再保留在内存中
+                        self.image_list_model.remove_rows(start, end)
+                    
+                    # 清空选择
+                    self.image_list_table.clearSelection()
+                    # 同步状态数组（表格已由模型更新）
+                    self.update_table()
                 # 触发显示图像信号
                 if len(self.image_list) > 0:
                     # 如果还有图像，尝试选择一个合适的行
@@ -257,10 +381,7 @@ class ImageListWidget(QWidget):
         """清空工作区的所有图像"""
         # 如果工作区不为空，显示确认对话框
         if self.image_list:
-            reply = QMessageBox.question(
-                self, '确认清空工作区', '确定要清空工作区中的所有图像吗？此操作无法撤销。',
-                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-            )
+            reply = ask_question(self, '确认清空工作区', '确定要清空工作区中的所有图像吗？此操作无法撤销。')
             
             if reply != QMessageBox.Yes:
                 return
@@ -269,7 +390,11 @@ class ImageListWidget(QWidget):
             return
         
         # 清空图像列表，确保所有数据不在内存中保留
-        self.image_list.clear()
+        for img_manager in self.image_list:
+            img_manager.unbind_state()
+            img_manager.unload()
+        self.image_list_model.clear()
+        self._path_set.clear()
         # 清空选择
         self.image_list_table.clearSelection()
         # 重置最后选中的索引
@@ -282,39 +407,78 @@ class ImageListWidget(QWidget):
         # 更新处理信息
         self._update_info('工作区已清空，所有图像数据已删除')
     
-    def update_table(self):
-        """更新图像列表表格"""
-        self.image_list_table.setRowCount(len(self.image_list))
-        
+    def _sync_states(self):
+        """按当前图像列表重建状态数组，并让每个图像的状态指向数组中对应位置"""
+        # 先按旧位置读出全部状态，再切换到新数组
+        self._states = np.fromiter(
+            (img_manager.state for img_manager in self.image_list),
+            dtype=np.uint8, count=len(self.image_list)
+        )
         for row, img_manager in enumerate(self.image_list):
-            # 设置编号 - P开头加五位数编号，居中显示
-            id_item = QTableWidgetItem(f'P{row + 1:05d}')
-            id_item.setTextAlignment(Qt.AlignCenter)
-            self.image_list_table.setItem(row, 0, id_item)
-            # 设置图片名 - 从image_path中提取文件名
-            img_name = os.path.basename(img_manager.image_path)
-            name_item = QTableWidgetItem(img_name)
-            # 设置tooltip显示完整文件路径
-            name_item.setToolTip(img_manager.image_path)
-            self.image_list_table.setItem(row, 1, name_item)
-            # 设置状态 - 存储状态值，使用代理类显示彩色圆圈
-            state_item = QTableWidgetItem()
-            # 将状态值存储在UserRole中，供代理类使用
-            state_item.setData(Qt.UserRole, img_manager.state)
-            # 设置居中对齐
-            state_item.setTextAlignment(Qt.AlignCenter)
-            self.image_list_table.setItem(row, 2, state_item)
+            img_manager.bind_state(self, row)
+    
+    def or_states(self, rows, mask):
+        """对指定行的图像状态批量按位或上 mask，并刷新状态列"""
+        self._states[rows] |= mask
+        self.image_list_model.states_changed(rows)
+    
+    @contextmanager
+    def _suspended_repaint(self):
+        """增删行等结构变化期间暂停表格重绘（模型信号照常发出），结束后统一重绘一次；嵌套使用时只有最外层生效"""
+        table = self.image_list_table
+        if not table.updatesEnabled():
+            yield
+            return
+        table.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            table.setUpdatesEnabled(True)
+    
+    def _refresh_state_cell(self, row):
+        """只刷新指定行的状态单元格"""
+        if 0 <= row < len(self.image_list):
+            self.image_list_model.states_changed((row,))
+    
+    def refresh_image_state(self, img_manager):
+        """单张图像的状态变化后刷新其所在行的状态单元格，通常是当前显示的图像"""
+        row = self.last_selected_index
+        if not (0 <= row < len(self.image_list) and self.image_list[row] is img_manager):
+            try:
+                row = self.image_list.index(img_manager)
+            except ValueError:
+                return
+        self._refresh_state_cell(row)
+    
+    def update_table(self):
+        """图像列表增删后同步状态数组，列表为空时重置显示区域（表格内容由模型直接提供）"""
+        self._sync_states()
         
         if len(self.image_list) == 0:
             # 重置图像显示区域
             if self.app and hasattr(self.app, 'reset_image_display'):
                 self.app.reset_image_display()
                 
+    def _on_index_clicked(self, index):
+        """表格单元格点击事件"""
+        self.on_image_selected(index.row(), index.column())
+    
     def on_image_selected(self, row, column):
         """处理图像选中事件"""
+        # 防止选中过程中触发的信号再次进入
+        if self._selecting:
+            return None
+        self._selecting = True
+        try:
+            return self._select_image(row)
+        finally:
+            self._selecting = False
+    
+    def _select_image(self, row):
+        """选中并显示指定行的图像"""
         if 0 <= row < len(self.image_list):
-            self.image_list_table.setCurrentCell(row, 0)
-            self.image_list_table.scrollToItem(self.image_list_table.item(row, 0))
+            # setCurrentIndex会自动滚动到该行，无需再调用scrollTo
+            self.image_list_table.setCurrentIndex(self.image_list_model.index(row, 0))
             # 更新最后选中的索引
             self.last_selected_index = row
             img_name = os.path.basename(self.image_list[row].image_path)
@@ -331,13 +495,14 @@ class ImageListWidget(QWidget):
                 self.app.reset_image_display()
         return None
     
+    def get_selected_rows(self):
+        """获取所有选中的行号（升序）"""
+        # 表格按整行选择，每个选中行只返回一个索引
+        return sorted(index.row() for index in self.image_list_table.selectionModel().selectedRows())
+    
     def get_selected_images(self):
         """获取所有选中的图像"""
-        selected_rows = set()
-        for item in self.image_list_table.selectedItems():
-            selected_rows.add(item.row())
-        
-        return [self.image_list[row] for row in selected_rows]
+        return [self.image_list[row] for row in self.get_selected_rows()]
         
     def get_last_selected_index(self):
         """获取最后一次点击的数据项索引"""
@@ -349,6 +514,31 @@ class ImageListWidget(QWidget):
             return self.image_list[self.last_selected_index]
         return None
     
+    def _iter_image_files(self, folder_path):
+        """递归遍历文件夹，逐个返回图像文件的完整路径；扩展名由Qt按名称过滤器匹配（不区分大小写）"""
+        it = QDirIterator(
+            folder_path, self.IMAGE_NAME_FILTERS,
+            QDir.Files | QDir.Hidden | QDir.NoDotAndDotDot, QDirIterator.Subdirectories
+        )
+        while it.hasNext():
+            yield os.path.normpath(it.next())
+    
+    def _create_image_managers(self, candidates):
+        """在线程池中并行创建ImageDataManager对象，candidates为(路径, 路径键)列表，按其顺序返回创建成功的对象"""
+        new_images = []
+        if not candidates:
+            return new_images
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(ImageDataManager, file_path, path_key) for file_path, path_key in candidates]
+            for (_, path_key), future in zip(candidates, futures):
+                try:
+                    new_images.append(future.result())
+                except ValueError as e:
+                    # 创建失败的图像不计入已导入路径
+                    self._path_set.discard(path_key)
+                    self._update_info(f'加载图像失败: {str(e)}')
+        return new_images
+    
     def _update_info(self, message):
         """更新处理信息"""
         if self.app and hasattr(self.app, 'update_process_info'):
@@ -1,20 +1,27 @@
 import sys
 import os
+import time
+from functools import partial
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
     QPushButton, QLabel, QLineEdit, QComboBox, QProgressBar,
-    QFrame, QHeaderView, QSizePolicy
+    QFrame, QHeaderView, QSizePolicy, QMessageBox
 )
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtCore import Qt, QTimer
 from image_list_widget import ImageListWidget
-from component_opt_widgets import ModeOptManager
+from component_opt_widgets import ModeOptManager, make_separator, ask_question
 from component_image_display import ModeDisplayManager
 from mode_manager import ModeManager
 
 class ImageProcessorApp(QMainWindow):
+    # 处理信息的最短刷新间隔（秒），约30Hz
+    INFO_REFRESH_INTERVAL = 0.033
+    
     def __init__(self):
         super().__init__()
+        self._last_info_time = 0.0  # 上次立即刷新处理信息的时间
+        self._buttons_update_pending = False  # 是否已安排在下一轮事件循环中更新按钮状态
         # 初始化模式管理器和图像显示管理器
         mode_opt_manager = ModeOptManager(self)
         mode_display_manager = ModeDisplayManager(self)
@@ -67,10 +74,7 @@ class ImageProcessorApp(QMainWindow):
         left_layout.addWidget(self.delete_work_button)
         
         # 添加横杠分隔符
-        separator = QFrame()
-        separator.setFrameShape(QFrame.HLine)
-        separator.setFrameShadow(QFrame.Sunken)
-        left_layout.addWidget(separator)
+        left_layout.addWidget(make_separator())
         
         # 模式选择按钮
         self.browse_mode_button = QPushButton('浏览模式')
@@ -107,10 +111,7 @@ class ImageProcessorApp(QMainWindow):
         center_layout.addWidget(self.image_display_widget)
         
         # 第一个横杠分隔符：图像显示区和模式操作区之间
-        separator1 = QFrame()
-        separator1.setFrameShape(QFrame.HLine)
-        separator1.setFrameShadow(QFrame.Sunken)
-        center_layout.addWidget(separator1)
+        center_layout.addWidget(make_separator())
         
         # 使用统一模式显示管理器设置UI
         self.mode_manager.setup_ui(center_layout, self.image_display_widget)
@@ -148,15 +149,11 @@ class ImageProcessorApp(QMainWindow):
         right_layout.addWidget(self.image_list_widget)
         
         # 创建左侧竖线分隔符
-        left_vline = QFrame()
-        left_vline.setFrameShape(QFrame.VLine)
-        left_vline.setFrameShadow(QFrame.Sunken)
+        left_vline = make_separator(QFrame.VLine)
         left_vline.setMaximumWidth(2)
         
         # 创建右侧竖线分隔符
-        right_vline = QFrame()
-        right_vline.setFrameShape(QFrame.VLine)
-        right_vline.setFrameShadow(QFrame.Sunken)
+        right_vline = make_separator(QFrame.VLine)
         right_vline.setMaximumWidth(2)
         
         # 将三个面板和分隔符添加到主布局
@@ -174,22 +171,27 @@ class ImageProcessorApp(QMainWindow):
         self.delete_work_button.clicked.connect(self.image_list_widget.delete_workspace)
         
         # 模式选择相关信号
-        self.browse_mode_button.clicked.connect(lambda: self.set_mode('browse'))
-        self.crop_mode_button.clicked.connect(lambda: self.set_mode('crop'))
-        self.resize_mode_button.clicked.connect(lambda: self.set_mode('resize'))
-        self.mark_mode_button.clicked.connect(lambda: self.set_mode('mark'))
-        self.correct_mode_button.clicked.connect(lambda: self.set_mode('correct'))
+        for mode, button in self.mode_button_map.items():
+            button.clicked.connect(partial(self._on_mode_button_clicked, mode))
         
         # 连接图像列表变化信号
         # self.image_list_widget.image_list_table.itemChanged.connect(self._update_buttons_state)
-        self.image_list_widget.image_list_table.model().rowsInserted.connect(self._update_buttons_state)
-        self.image_list_widget.image_list_table.model().rowsRemoved.connect(self._update_buttons_state)
+        # 批量增删时会连续触发多次信号，合并为一次按钮状态更新
+        self.image_list_widget.image_list_table.model().rowsInserted.connect(self._schedule_buttons_update)
+        self.image_list_widget.image_list_table.model().rowsRemoved.connect(self._schedule_buttons_update)
         
         # 初始按钮状态
         self._update_buttons_state()
 
+    def _schedule_buttons_update(self):
+        """安排在当前事件处理结束后更新一次按钮状态"""
+        if not self._buttons_update_pending:
+            self._buttons_update_pending = True
+            QTimer.singleShot(0, self._update_buttons_state)
+
     def _update_buttons_state(self):
         """根据图像列表状态更新按钮可用状态"""
+        self._buttons_update_pending = False
         has_images = len(self.image_list_widget.image_list) > 0
 
         # 文件操作按钮
@@ -206,6 +208,10 @@ class ImageProcessorApp(QMainWindow):
         if not has_images:
             self.set_mode('empty')
         
+    def _on_mode_button_clicked(self, mode, checked=False):
+        """模式按钮点击事件，clicked信号携带的checked参数不能作为confirm传给set_mode"""
+        self.set_mode(mode)
+    
     def set_mode(self, mode, confirm=True):
         """设置当前模式，委托给统一模式显示管理器处理，并显示确认对话框"""
         # 空模式不需要确认对话框
@@ -219,7 +225,6 @@ class ImageProcessorApp(QMainWindow):
                 self._set_mode_button_state(mode, False)
             return
         
-        from PyQt5.QtWidgets import QMessageBox
         # 显示确认对话框
         mode_names = {
             'browse': '浏览模式', 
@@ -229,13 +234,7 @@ class ImageProcessorApp(QMainWindow):
             'correct': '修正模式'
         }
         mode_display_name = mode_names.get(mode, mode)
-        reply = QMessageBox.question(
-            self,
-            '确认切换模式',
-            f'确定要切换到{mode_display_name}吗？',
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No  # 默认选择"否"以防止误操作
-        )
+        reply = ask_question(self, '确认切换模式', f'确定要切换到{mode_display_name}吗？')
         
         # 如果用户确认，才切换模式
         if reply == QMessageBox.Yes:
@@ -268,7 +267,11 @@ class ImageProcessorApp(QMainWindow):
     def update_process_info(self, info):
         """更新处理信息"""
         self.process_info_label.setText(f'处理信息: {info}')
-        QApplication.processEvents()
+        # 长时间处理中仍需及时显示进度，但限制立即刷新的频率，其余交给事件循环合并重绘
+        now = time.monotonic()
+        if now - self._last_info_time > self.INFO_REFRESH_INTERVAL:
+            self._last_info_time = now
+            QApplication.processEvents()
     
     def get_mode_name(self):
         """获取当前模式的名称"""
@@ -286,6 +289,9 @@ class ImageProcessorApp(QMainWindow):
             
             # 设置图像到模式显示管理器
             self.mode_manager.set_image(img_manager)
+            # 在后台预先解码前后相邻的图像，逐张浏览时无需等待解码
+            image_list = self.image_list_widget.image_list
+            self.mode_manager.prefetch([image_list[i] for i in (row + 1, row - 1) if 0 <= i < len(image_list)])
             
             # 更新处理信息
             self.update_process_info(f'{os.path.basename(img_path)}, ' \
@@ -298,14 +304,6 @@ class ImageProcessorApp(QMainWindow):
         """重置图像显示区域到初始状态"""
         self.mode_manager.reset()
         
-    def eventFilter(self, obj, event):
-        """事件过滤器，用于处理图像标签的大小变化"""
-        current_component = self.mode_manager.get_current_display_component()
-        if obj == current_component and event.type() == QEvent.Resize:
-            # 调用当前组件的resizeEvent方法
-            obj.resizeEvent(event)
-        return super().eventFilter(obj, event)
-    
 if __name__ == '__main__':
     app = QApplication(sys.argv) 
     window = ImageProcessorApp()
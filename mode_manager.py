@@ -162,6 +162,16 @@ class ModeManager:
         if self.image_display_manager:
             self.image_display_manager.set_image(image_manager)
     
+    def prefetch(self, image_managers):
+        """
+        在后台预先解码可能即将查看的图像
+        
+        参数:
+            image_managers: 图像管理器实例列表
+        """
+        if self.image_display_manager:
+            self.image_display_manager.prefetch(image_managers)
+    
     def reset(self):
         """
         重置所有组件
@@ -171,14 +181,4 @@ class ModeManager:
         
         # 2. 重置图像显示
         if self.image_display_manager:
-            self.image_display_manager.reset()
-    
-    def resizeEvent(self, event):
-        """
-        处理窗口大小变化事件
-        
-        参数:
-            event: 窗口大小变化事件对象
-        """
-        if self.image_display_manager:
-            self.image_display_manager.resizeEvent(event)
\ No newline at end of file
+            self.image_display_manager.reset()
\ No newline at end of file